@@ -1059,3 +1059,143 @@ TEST(mocked_api_get_physdev_profile_support, vulkan13_supported_version) {
     EXPECT_EQ(result, VK_SUCCESS);
     EXPECT_EQ(supported, VK_TRUE);
 }
+
+TEST(mocked_api_get_physdev_profile_support, vulkan13_multiple_profiles) {
+    MockVulkanAPI mock;
+
+#if WITH_DEBUG_MESSAGES
+    MockDebugMessageCallback cb(
+        {"Checking device support for profile VP_KHR_roadmap_2022 "
+         "(deviceName=, driverName=, driverInfo=). You may find the details "
+         "of the capabilities of this device on https://vulkan.gpuinfo.org/",
+         "Checking device support for profile VP_KHR_roadmap_2022 "
+         "(deviceName=, driverName=, driverInfo=). You may find the details "
+         "of the capabilities of this device on https://vulkan.gpuinfo.org/",
+         "Unsupported profile version: " + std::to_string(VP_KHR_ROADMAP_2022_SPEC_VERSION + 1)});
+#endif
+
+    mock.SetInstanceAPIVersion(VK_API_VERSION_1_3);
+    mock.SetDeviceAPIVersion(VK_API_VERSION_1_3);
+
+    mock.SetDeviceExtensions(mock.vkPhysicalDevice, {
+        VK_EXT(VK_KHR_GLOBAL_PRIORITY),
+    });
+
+    const VpProfileProperties profile{VP_KHR_ROADMAP_2022_NAME, VP_KHR_ROADMAP_2022_SPEC_VERSION};
+
+    VkPhysicalDeviceVulkan13Features vulkan13Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_3_FEATURES};
+    VkPhysicalDeviceVulkan12Features vulkan12Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_2_FEATURES, &vulkan13Features};
+    VkPhysicalDeviceVulkan11Features vulkan11Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_FEATURES, &vulkan12Features};
+    VkPhysicalDeviceFeatures2 features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_FEATURES_2, &vulkan11Features};
+    vpGetProfileFeatures(&profile, &features);
+
+    mock.SetFeatures({VK_STRUCT(features), VK_STRUCT(vulkan11Features), VK_STRUCT(vulkan12Features), VK_STRUCT(vulkan13Features)});
+
+    VkPhysicalDeviceVulkan13Properties vulkan13Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_3_PROPERTIES};
+    VkPhysicalDeviceVulkan12Properties vulkan12Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_2_PROPERTIES, &vulkan13Properties};
+    VkPhysicalDeviceVulkan11Properties vulkan11Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_PROPERTIES, &vulkan12Properties};
+    VkPhysicalDeviceProperties2 props{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_PROPERTIES_2, &vulkan11Properties};
+    vpGetProfileProperties(&profile, &props);
+
+    mock.SetProperties(
+        {VK_STRUCT(props), VK_STRUCT(vulkan11Properties), VK_STRUCT(vulkan12Properties), VK_STRUCT(vulkan13Properties)});
+
+    uint32_t formatCount;
+    vpGetProfileFormats(&profile, &formatCount, nullptr);
+    std::vector<VkFormat> formats(formatCount);
+    vpGetProfileFormats(&profile, &formatCount, formats.data());
+    for (size_t i = 0; i < formatCount; ++i) {
+        VkFormatProperties2KHR formatProps{VK_STRUCTURE_TYPE_FORMAT_PROPERTIES_2_KHR};
+        vpGetProfileFormatProperties(&profile, formats[i], &formatProps);
+        mock.AddFormat(formats[i], {VK_STRUCT(formatProps)});
+    }
+
+    // The second profile requests a newer version of the profile than the one in the library
+    const VpProfileProperties profiles[] = {profile, {VP_KHR_ROADMAP_2022_NAME, VP_KHR_ROADMAP_2022_SPEC_VERSION + 1}};
+
+    VkBool32 supported[] = {VK_FALSE, VK_TRUE};
+    VkResult result = vpGetPhysicalDeviceProfilesSupport(mock.vkInstance, mock.vkPhysicalDevice, 2, profiles, supported);
+
+    EXPECT_EQ(result, VK_SUCCESS);
+    EXPECT_EQ(supported[0], VK_TRUE);
+    EXPECT_EQ(supported[1], VK_FALSE);
+}
+
+TEST(mocked_api_get_physdev_profile_support, vulkan13_physical_device_cache) {
+    MockVulkanAPI mock;
+
+#if WITH_DEBUG_MESSAGES
+    MockDebugMessageCallback cb(
+        {"Checking device support for profile VP_KHR_roadmap_2022 "
+         "(deviceName=, driverName=, driverInfo=). You may find the details "
+         "of the capabilities of this device on https://vulkan.gpuinfo.org/",
+         "Checking device support for profile VP_KHR_roadmap_2022 "
+         "(deviceName=, driverName=, driverInfo=). You may find the details "
+         "of the capabilities of this device on https://vulkan.gpuinfo.org/",
+         "Checking device support for profile VP_KHR_roadmap_2022 "
+         "(deviceName=, driverName=, driverInfo=). You may find the details "
+         "of the capabilities of this device on https://vulkan.gpuinfo.org/",
+         "Unsupported extension: VK_KHR_global_priority"});
+#endif
+
+    mock.SetInstanceAPIVersion(VK_API_VERSION_1_3);
+    mock.SetDeviceAPIVersion(VK_API_VERSION_1_3);
+
+    mock.SetDeviceExtensions(mock.vkPhysicalDevice, {
+        VK_EXT(VK_KHR_GLOBAL_PRIORITY),
+    });
+
+    const VpProfileProperties profile{VP_KHR_ROADMAP_2022_NAME, VP_KHR_ROADMAP_2022_SPEC_VERSION};
+
+    VkPhysicalDeviceVulkan13Features vulkan13Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_3_FEATURES};
+    VkPhysicalDeviceVulkan12Features vulkan12Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_2_FEATURES, &vulkan13Features};
+    VkPhysicalDeviceVulkan11Features vulkan11Features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_FEATURES, &vulkan12Features};
+    VkPhysicalDeviceFeatures2 features{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_FEATURES_2, &vulkan11Features};
+    vpGetProfileFeatures(&profile, &features);
+
+    mock.SetFeatures({VK_STRUCT(features), VK_STRUCT(vulkan11Features), VK_STRUCT(vulkan12Features), VK_STRUCT(vulkan13Features)});
+
+    VkPhysicalDeviceVulkan13Properties vulkan13Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_3_PROPERTIES};
+    VkPhysicalDeviceVulkan12Properties vulkan12Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_2_PROPERTIES, &vulkan13Properties};
+    VkPhysicalDeviceVulkan11Properties vulkan11Properties{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_PROPERTIES, &vulkan12Properties};
+    VkPhysicalDeviceProperties2 props{VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_PROPERTIES_2, &vulkan11Properties};
+    vpGetProfileProperties(&profile, &props);
+
+    mock.SetProperties(
+        {VK_STRUCT(props), VK_STRUCT(vulkan11Properties), VK_STRUCT(vulkan12Properties), VK_STRUCT(vulkan13Properties)});
+
+    uint32_t formatCount;
+    vpGetProfileFormats(&profile, &formatCount, nullptr);
+    std::vector<VkFormat> formats(formatCount);
+    vpGetProfileFormats(&profile, &formatCount, formats.data());
+    for (size_t i = 0; i < formatCount; ++i) {
+        VkFormatProperties2KHR formatProps{VK_STRUCTURE_TYPE_FORMAT_PROPERTIES_2_KHR};
+        vpGetProfileFormatProperties(&profile, formats[i], &formatProps);
+        mock.AddFormat(formats[i], {VK_STRUCT(formatProps)});
+    }
+
+    vpSetPhysicalDeviceCacheEnabled(VK_TRUE);
+
+    VkBool32 supported = VK_FALSE;
+    VkResult result = vpGetPhysicalDeviceProfileSupport(mock.vkInstance, mock.vkPhysicalDevice, &profile, &supported);
+    EXPECT_EQ(result, VK_SUCCESS);
+    EXPECT_EQ(supported, VK_TRUE);
+
+    // The device extensions are not queried again from the driver while they are cached
+    mock.SetDeviceExtensions(mock.vkPhysicalDevice, {});
+
+    supported = VK_FALSE;
+    result = vpGetPhysicalDeviceProfileSupport(mock.vkInstance, mock.vkPhysicalDevice, &profile, &supported);
+    EXPECT_EQ(result, VK_SUCCESS);
+    EXPECT_EQ(supported, VK_TRUE);
+
+    // Discard the cached capabilities of all the physical devices of the instance, as done before destroying it
+    vpInvalidatePhysicalDeviceCache(mock.vkInstance, VK_NULL_HANDLE);
+
+    supported = VK_TRUE;
+    result = vpGetPhysicalDeviceProfileSupport(mock.vkInstance, mock.vkPhysicalDevice, &profile, &supported);
+    EXPECT_EQ(result, VK_SUCCESS);
+    EXPECT_EQ(supported, VK_FALSE);
+
+    vpSetPhysicalDeviceCacheEnabled(VK_FALSE);
+}
@@ -189,18 +189,19 @@ TEST(test_library_util, GetStructure) {
 }
 
 TEST(test_library_util, CheckExtension) {
+    // vpCheckExtension requires the extensions to be sorted by name
     static const VkExtensionProperties test_data[] = {VkExtensionProperties{"VK_EXT_extended_dynamic_state2", 1},
-                                                      VkExtensionProperties{"VK_EXT_texel_buffer_alignment", 1},
-                                                      VkExtensionProperties{"VK_EXT_subgroup_size_control", 2},
-                                                      VkExtensionProperties{"VK_EXT_shader_demote_to_helper_invocation", 1},
-                                                      VkExtensionProperties{"VK_EXT_private_data", 1},
-                                                      VkExtensionProperties{"VK_EXT_pipeline_creation_cache_control", 1},
-                                                      VkExtensionProperties{"VK_EXT_inline_uniform_block", 1},
                                                       VkExtensionProperties{"VK_EXT_image_robustness", 1},
-                                                      VkExtensionProperties{"VK_KHR_zero_initialize_workgroup_memory", 1},
-                                                      VkExtensionProperties{"VK_KHR_synchronization2", 1},
+                                                      VkExtensionProperties{"VK_EXT_inline_uniform_block", 1},
+                                                      VkExtensionProperties{"VK_EXT_pipeline_creation_cache_control", 1},
+                                                      VkExtensionProperties{"VK_EXT_private_data", 1},
+                                                      VkExtensionProperties{"VK_EXT_shader_demote_to_helper_invocation", 1},
+                                                      VkExtensionProperties{"VK_EXT_subgroup_size_control", 2},
+                                                      VkExtensionProperties{"VK_EXT_texel_buffer_alignment", 1},
+                                                      VkExtensionProperties{"VK_KHR_imageless_framebuffer", 1},
                                                       VkExtensionProperties{"VK_KHR_shader_terminate_invocation", 1},
-                                                      VkExtensionProperties{"VK_KHR_imageless_framebuffer", 1}};
+                                                      VkExtensionProperties{"VK_KHR_synchronization2", 1},
+                                                      VkExtensionProperties{"VK_KHR_zero_initialize_workgroup_memory", 1}};
 
     EXPECT_TRUE(detail::vpCheckExtension(test_data, ARRAY_SIZE(test_data), "VK_KHR_synchronization2"));
 
@@ -326,3 +327,64 @@ TEST(test_library_util, check_extension_found) {
                                              info.ppEnabledExtensionNames[i]));
     }
 }
+
+static bool requireGraphicsQueueFamily(VkBaseOutStructure *p) {
+    const VkQueueFamilyProperties2KHR *props = static_cast<const VkQueueFamilyProperties2KHR *>(static_cast<const void *>(p));
+    return (props->queueFamilyProperties.queueFlags & VK_QUEUE_GRAPHICS_BIT) != 0;
+}
+
+TEST(test_library_util, check_queue_families_many) {
+    const detail::VpQueueFamilyDesc graphicsQueueFamily{nullptr, requireGraphicsQueueFamily};
+
+    // Devices exposing many queue families where the graphics queue families are the last ones, which used to
+    // take a number of checks growing with the factorial of the number of queue families
+    for (uint32_t count = 8; count <= 16; ++count) {
+        std::vector<VkQueueFamilyProperties2KHR> props(count, {VK_STRUCTURE_TYPE_QUEUE_FAMILY_PROPERTIES_2_KHR});
+        for (uint32_t i = 0; i < count; ++i) {
+            props[i].queueFamilyProperties.queueFlags = i < count / 2 ? VK_QUEUE_TRANSFER_BIT : VK_QUEUE_GRAPHICS_BIT;
+            props[i].queueFamilyProperties.queueCount = 1;
+        }
+
+        const uint32_t graphicsCount = count - count / 2;
+        std::vector<const detail::VpQueueFamilyDesc *> supportedQueueFamilies(graphicsCount, &graphicsQueueFamily);
+        std::vector<const detail::VpQueueFamilyDesc *> unsupportedQueueFamilies(graphicsCount + 1, &graphicsQueueFamily);
+
+        EXPECT_TRUE(detail::vpCheckQueueFamilies(props.data(), count, supportedQueueFamilies));
+        EXPECT_FALSE(detail::vpCheckQueueFamilies(props.data(), count, unsupportedQueueFamilies));
+    }
+}
+
+TEST(test_library_util, get_profile_desc) {
+    uint32_t count = 0;
+    EXPECT_EQ(VK_SUCCESS, vpGetProfiles(&count, nullptr));
+    std::vector<VpProfileProperties> profiles(count);
+    EXPECT_EQ(VK_SUCCESS, vpGetProfiles(&count, profiles.data()));
+
+    for (uint32_t i = 0; i < count; ++i) {
+        const detail::VpProfileDesc *pDesc = detail::vpGetProfileDesc(profiles[i].profileName);
+        EXPECT_NE(nullptr, pDesc);
+        if (pDesc != nullptr) {
+            EXPECT_STREQ(profiles[i].profileName, pDesc->props.profileName);
+        }
+    }
+
+    const char unknownProfileName[VP_MAX_PROFILE_NAME_SIZE] = "VP_UNKNOWN_profile";
+    EXPECT_EQ(nullptr, detail::vpGetProfileDesc(unknownProfileName));
+}
+
+TEST(test_library_util, check_extension_sorted) {
+    std::vector<VkExtensionProperties> extensions(3);
+    strcpy(extensions[0].extensionName, VK_KHR_MAINTENANCE_3_EXTENSION_NAME);
+    strcpy(extensions[1].extensionName, VK_EXT_ROBUSTNESS_2_EXTENSION_NAME);
+    strcpy(extensions[2].extensionName, VK_KHR_DRIVER_PROPERTIES_EXTENSION_NAME);
+
+    detail::vpSortExtensions(extensions);
+
+    EXPECT_STREQ(VK_EXT_ROBUSTNESS_2_EXTENSION_NAME, extensions[0].extensionName);
+    EXPECT_STREQ(VK_KHR_DRIVER_PROPERTIES_EXTENSION_NAME, extensions[1].extensionName);
+    EXPECT_STREQ(VK_KHR_MAINTENANCE_3_EXTENSION_NAME, extensions[2].extensionName);
+
+    EXPECT_TRUE(detail::vpCheckExtension(extensions.data(), extensions.size(), VK_KHR_MAINTENANCE_3_EXTENSION_NAME));
+    EXPECT_TRUE(detail::vpCheckExtension(extensions.data(), extensions.size(), VK_EXT_ROBUSTNESS_2_EXTENSION_NAME));
+    EXPECT_FALSE(detail::vpCheckExtension(extensions.data(), extensions.size(), VK_KHR_MAINTENANCE_4_EXTENSION_NAME));
+}
@@ -698,6 +698,14 @@ if __name__ == '__main__':
                         help='Override the development stage of the generated profile. If the argument is not set, the value is set to "stable".')
     parser.add_argument('--mode', '-m', action='store', choices=['union', 'intersection'], default='intersection',
                         help='Mode of profile combination. If the argument is not set, the value is set to "intersection".')
+    parser.add_argument('--registry-cache', action='store', default=gen_profiles_solution.VulkanRegistryCache.getDefaultDir(),
+                        help='Directory used to cache the parsed registry across invocations. If the argument is not set, a per-user cache directory is used.')
+    parser.add_argument('--no-registry-cache', action='store_true',
+                        help='Parse the registry without reading or storing the registry cache.')
+    parser.add_argument('--stream-profiles', action='store_true',
+                        help='Only decode the profiles and the capability blocks being merged from the profile files.')
+    parser.add_argument('--profile-index', action='store',
+                        help='Index file mapping profile names to the input files defining them, used to only open the files of the --input-profiles.')
           
     parser.set_defaults(mode='intersection')
 
@@ -735,12 +743,22 @@ if __name__ == '__main__':
     if args.input is not None:
         profiles_not_found = profile_names.copy()
         # Find all jsons in the folder
-        paths = [args.input + '/' + pos_json for pos_json in os.listdir(args.input) if pos_json.endswith('.json')]
+        if args.profile_index is not None and len(profile_names) > 0:
+            # Only open the files defining the requested profiles
+            profile_index = gen_profiles_solution.VulkanProfileIndex(args.profile_index)
+            profile_index.update(args.input)
+            paths = [args.input + '/' + pos_json for pos_json in profile_index.getFiles(profile_names)]
+        else:
+            paths = [args.input + '/' + pos_json for pos_json in os.listdir(args.input) if pos_json.endswith('.json')]
         json_files = list()
         for i in range(len(paths)):
             print('Opening: ' + paths[i])
-            file = open(paths[i], "r")
-            json_files.append(json.load(file))
+            if args.stream_profiles:
+                # Capability blocks are only decoded when merged, instead of keeping every file in memory
+                json_files.append(gen_profiles_solution.VulkanJsonObjectReader.load(paths[i]))
+            else:
+                file = open(paths[i], "r")
+                json_files.append(json.load(file))
         # We need to iterate through profile names first, so the indices of jsons and profiles lists will match
         if (len(profile_names) > 0):
             for profile_name in profile_names:
@@ -765,7 +783,7 @@ if __name__ == '__main__':
         print('ERROR: Not input directory set, use --input')
         exit()
 
-    registry = gen_profiles_solution.VulkanRegistry(args.registry)
+    registry = gen_profiles_solution.VulkanRegistryCache.load(args.registry, None if args.no_registry_cache else args.registry_cache)
     profile_merger = ProfileMerger(registry)
 
     if args.profile_desc is not None:
@@ -1614,6 +1614,40 @@ void CopyUnsetQueueFamilyProperties(const QueueFamilyProperties *device, QueueFa
     }
 }
 
+// Finds an augmenting path from a profile queue family to a device queue family that isn't matched yet, only device queue
+// families starting at first_device are considered (Kuhn's algorithm)
+bool MatchQueueFamily(const std::vector<std::vector<bool>> &matches, uint32_t profile_index, uint32_t first_device,
+                      std::vector<bool> &visited, std::vector<uint32_t> &device_match) {
+    for (uint32_t i = first_device; i < device_match.size(); ++i) {
+        if (!matches[i][profile_index] || visited[i]) {
+            continue;
+        }
+        visited[i] = true;
+        if (device_match[i] == UINT32_MAX || MatchQueueFamily(matches, device_match[i], first_device, visited, device_match)) {
+            device_match[i] = profile_index;
+            return true;
+        }
+    }
+    return false;
+}
+
+// Checks whether each profile queue family that isn't used yet can be matched with a separate device queue family starting
+// at first_device
+bool MatchRemainingQueueFamilies(const std::vector<std::vector<bool>> &matches, const std::vector<bool> &profile_used,
+                                 uint32_t first_device) {
+    std::vector<uint32_t> device_match(matches.size(), UINT32_MAX);
+    for (uint32_t i = 0; i < profile_used.size(); ++i) {
+        if (profile_used[i]) {
+            continue;
+        }
+        std::vector<bool> visited(matches.size(), false);
+        if (!MatchQueueFamily(matches, i, first_device, visited, device_match)) {
+            return false;
+        }
+    }
+    return true;
+}
+
 bool JsonLoader::OrderQueueFamilyProperties(ArrayOfVkQueueFamilyProperties *qfp) {
     if (qfp->empty()) {
         return true;
@@ -1622,44 +1656,53 @@ bool JsonLoader::OrderQueueFamilyProperties(ArrayOfVkQueueFamilyProperties *qfp)
     if (pdd_->device_queue_family_properties_.size() < qfp->size()) {
         return false;
     }
-    // Find all permutations and see if any of them supports profile queue families
-    std::vector<uint32_t> permutations(pdd_->device_queue_family_properties_.size());
-    uint32_t count = static_cast<uint32_t>(permutations.size());
+    uint32_t count = static_cast<uint32_t>(pdd_->device_queue_family_properties_.size());
+    uint32_t profile_count = static_cast<uint32_t>(qfp->size());
+    std::vector<std::vector<bool>> matches(count, std::vector<bool>(profile_count, false));
     for (uint32_t i = 0; i < count; ++i) {
-        permutations[i] = i;
+        for (uint32_t j = 0; j < profile_count; ++j) {
+            matches[i][j] = QueueFamilyAndExtensionsMatch(pdd_->device_queue_family_properties_[i], (*qfp)[j]);
+        }
     }
-    do {
-        bool match = true;
-        for (uint32_t i = 0; i < count; ++i) {
-            if (permutations[i] < qfp->size() &&
-                !QueueFamilyAndExtensionsMatch(pdd_->device_queue_family_properties_[i], (*qfp)[permutations[i]])) {
-                match = false;
+    std::vector<bool> profile_used(profile_count, false);
+    if (!MatchRemainingQueueFamilies(matches, profile_used, 0)) {
+        LogMessage(DEBUG_REPORT_WARNING_BIT,
+                   format("Device supports all individual profile queue families, but not all of them simultaneously.\\n"));
+        return false;
+    }
+    // Assign to each device queue family the first profile queue family that still allows matching all the remaining ones,
+    // which results in the same order as the first matching permutation of the profile queue families
+    std::vector<uint32_t> assignment(count, UINT32_MAX);
+    for (uint32_t i = 0; i < count; ++i) {
+        for (uint32_t j = 0; j < profile_count; ++j) {
+            if (profile_used[j] || !matches[i][j]) {
+                continue;
+            }
+            profile_used[j] = true;
+            if (MatchRemainingQueueFamilies(matches, profile_used, i + 1)) {
+                assignment[i] = j;
                 break;
             }
+            profile_used[j] = false;
         }
-        if (match) {
-            // Empty queue families at the end are not needed
-            while (permutations[count - 1] >= qfp->size()) {
-                --count;
-            }
-            ArrayOfVkQueueFamilyProperties ordered;
-            for (uint32_t i = 0; i < count; ++i) {
-                if (permutations[i] < qfp->size()) {
-                    ordered.push_back((*qfp)[permutations[i]]);
-                } else {
-                    ordered.push_back(QueueFamilyProperties());
-                }
-            }
-            *qfp = ordered;
-            for (uint32_t i = 0; i < count; ++i) {
-                CopyUnsetQueueFamilyProperties(&pdd_->device_queue_family_properties_[i], &(*qfp)[i]);
-            }
-            return true;
+    }
+    // Empty queue families at the end are not needed
+    while (assignment[count - 1] == UINT32_MAX) {
+        --count;
+    }
+    ArrayOfVkQueueFamilyProperties ordered;
+    for (uint32_t i = 0; i < count; ++i) {
+        if (assignment[i] != UINT32_MAX) {
+            ordered.push_back((*qfp)[assignment[i]]);
+        } else {
+            ordered.push_back(QueueFamilyProperties());
         }
-    } while (std::next_permutation(permutations.begin(), permutations.end()));
-    LogMessage(DEBUG_REPORT_WARNING_BIT,
-               format("Device supports all individual profile queue families, but not all of them simultaneously.\\n"));
-    return false;
+    }
+    *qfp = ordered;
+    for (uint32_t i = 0; i < count; ++i) {
+        CopyUnsetQueueFamilyProperties(&pdd_->device_queue_family_properties_[i], &(*qfp)[i]);
+    }
+    return true;
 }
 '''
 
@@ -2033,7 +2076,8 @@ VkResult JsonLoader::LoadDevice(PhysicalDeviceData *pdd) {
             const auto &caps = profiles[profile]["capabilities"];
 
             for (const auto &cap : caps) {
-                capabilities.push_back(cap.asString());
+                // Alternative capabilities are simulated using the first alternative
+                capabilities.push_back(cap.isArray() ? cap[0].asString() : cap.asString());
             }
 
             found_profile = true;
@@ -2046,7 +2090,8 @@ VkResult JsonLoader::LoadDevice(PhysicalDeviceData *pdd) {
             const auto &caps = profiles[profile]["capabilities"];
 
             for (const auto &cap : caps) {
-                capabilities.push_back(cap.asString());
+                // Alternative capabilities are simulated using the first alternative
+                capabilities.push_back(cap.isArray() ? cap[0].asString() : cap.asString());
             }
 
             LogMessage(DEBUG_REPORT_WARNING_BIT,
@@ -3610,8 +3655,9 @@ class VulkanProfilesLayerGenerator():
 
     def generate_duplicated_checks(self, extends):
         gen = ''
-        for name, value in registry.structs.items():
-            if extends in value.extends and value.isAlias == False:
+        for name in registry.structsByExtends.get(extends, []):
+            value = registry.structs[name]
+            if value.isAlias == False:
                 aliases = value.aliases.copy()
                 aliases.remove(name)
                 promoted = self.find_promoted_struct(value)
@@ -3851,8 +3897,9 @@ class VulkanProfilesLayerGenerator():
         gen += '            VkBaseOutStructure *structure = (VkBaseOutStructure *)place;\n\n'
         gen += '            switch (structure->sType) {\n'
         
-        for name, value  in registry.structs.items():
-            if 'VkQueueFamilyProperties2' in value.extends and not value.isAlias:
+        for name in registry.structsByExtends.get('VkQueueFamilyProperties2', []):
+            value = registry.structs[name]
+            if not value.isAlias:
                 gen += '                case ' + value.sType + ': {\n'
                 gen += '                    ' + name + ' *data = (' + name + ' *)place;\n'
                 gen += '                    void *pNext = data->pNext;\n'
@@ -4171,31 +4218,21 @@ class VulkanProfilesLayerGenerator():
         properties_alias = []
         features = []
         features_alias = []
-        for name, value  in registry.structs.items():
-            if ('VkPhysicalDeviceProperties2' in value.extends):
-                if (value.isAlias == False):
-                    properties.append((name, value.definedByExtensions))
-                else:
-                    properties_alias.append((name, value.definedByExtensions, value.aliases))
-            if ('VkPhysicalDeviceFeatures2' in value.extends):
-                if (value.isAlias == False):
-                    features.append((name, value.definedByExtensions))
-                else:
-                    features_alias.append((name, value.definedByExtensions, value.aliases))
-
-        for property_alias in properties_alias:
-            for i, j in enumerate(properties):
-                for alias in property_alias[2]:
-                    if alias == properties[i][0] and self.should_replace(properties[i][1], property_alias[1]):
-                        properties[i] = (property_alias[0], property_alias[1])
-                        break
-
-        for feature_alias in features_alias:
-            for i, j in enumerate(features):
-                for alias in feature_alias[2]:
-                    if alias == features[i][0] and self.should_replace(features[i][1], feature_alias[1]):
-                        features[i] = (feature_alias[0], feature_alias[1])
-                        break
+        for name in registry.structsByExtends.get('VkPhysicalDeviceProperties2', []):
+            value = registry.structs[name]
+            if (value.isAlias == False):
+                properties.append((name, value.definedByExtensions))
+            else:
+                properties_alias.append((name, value.definedByExtensions, value.aliases))
+        for name in registry.structsByExtends.get('VkPhysicalDeviceFeatures2', []):
+            value = registry.structs[name]
+            if (value.isAlias == False):
+                features.append((name, value.definedByExtensions))
+            else:
+                features_alias.append((name, value.definedByExtensions, value.aliases))
+
+        self.replace_aliases(properties, properties_alias)
+        self.replace_aliases(features, features_alias)
 
         self.non_extension_properties = []
         for property_name, ext in properties:
@@ -4207,19 +4244,36 @@ class VulkanProfilesLayerGenerator():
             if not ext:
                 self.non_extension_features.append(feature_name)
 
+        extension_properties = dict()
+        for property_name, ext in properties:
+            if ext:
+                extension_properties.setdefault(ext[0], []).append(property_name)
+        extension_features = dict()
+        for feature_name, ext in features:
+            if ext:
+                extension_features.setdefault(ext[0], []).append(feature_name)
+
         self.extension_structs = []
         for extension in registry.extensions:
-            feature_names = []
-            property_names = []
-            for property in properties:
-                if property[1] and property[1][0] == extension:
-                    property_names.append(property[0])
-            for feature in features:
-                if feature[1] and feature[1][0] == extension:
-                    feature_names.append(feature[0])
+            property_names = extension_properties.get(extension, [])
+            feature_names = extension_features.get(extension, [])
             if feature_names or property_names:
                 self.extension_structs.append((extension, property_names, feature_names))
 
+    def replace_aliases(self, structs, structs_alias):
+        # Replace structs with their preferred alias, looking them up by their current name
+        indices = dict()
+        for i, struct in enumerate(structs):
+            indices[struct[0]] = i
+        for name, ext, aliases in structs_alias:
+            for alias in aliases:
+                i = indices.get(alias)
+                if i != None and self.should_replace(structs[i][1], ext):
+                    del indices[alias]
+                    structs[i] = (name, ext)
+                    indices[name] = i
+                    break
+
     def get_ext(self, extension):
         i = 3
         while (i < len(extension)):
@@ -4383,6 +4437,7 @@ if __name__ == '__main__':
 
     parser.add_argument('-registry', action='store', help='Use specified registry file instead of vk.xml')
     parser.add_argument('-outLayer', action='store', help='Output the layer source file')
+    parser.add_argument('-registryCache', action='store', help='Directory used to cache the parsed registry across invocations')
 
     args = parser.parse_args()
 
@@ -4394,7 +4449,7 @@ if __name__ == '__main__':
     if args.outLayer is not None:
         outputPath = args.outLayer
 
-    registry = gen_profiles_solution.VulkanRegistry(registryPath)
+    registry = gen_profiles_solution.VulkanRegistryCache.load(registryPath, args.registryCache)
 
     generator = VulkanProfilesLayerGenerator()
     generator.generate(outputPath, registry)
@@ -18,11 +18,23 @@
 
 import os
 import re
+import sys
 import itertools
 import functools
 import argparse
+import concurrent.futures
+import hashlib
+import pickle
+import tempfile
+import mmap
+import filecmp
+import time
 from typing import OrderedDict
 import xml.etree.ElementTree as etree
+try:
+    import lxml.etree as lxmletree
+except ImportError:
+    lxmletree = None
 import json
 import jsonschema
 from collections import deque
@@ -153,6 +165,8 @@ CPP_HEADER = '''
 #include <cmath>
 #include <vector>
 #include <algorithm>
+#include <memory>
+#include <mutex>
 '''
 
 HPP_HEADER = '''
@@ -168,6 +182,8 @@ HPP_HEADER = '''
 #include <cmath>
 #include <vector>
 #include <algorithm>
+#include <memory>
+#include <mutex>
 '''
 
 HPP_FOOTER = '''
@@ -262,6 +278,19 @@ VPAPI_ATTR VkResult vpCreateInstance(const VpInstanceCreateInfo *pCreateInfo,
 VPAPI_ATTR VkResult vpGetPhysicalDeviceProfileSupport(VkInstance instance, VkPhysicalDevice physicalDevice,
                                                       const VpProfileProperties *pProfile, VkBool32 *pSupported);
 
+// Check whether each of multiple profiles is supported by the physical device, querying the device only once
+VPAPI_ATTR VkResult vpGetPhysicalDeviceProfilesSupport(VkInstance instance, VkPhysicalDevice physicalDevice,
+                                                       uint32_t profileCount, const VpProfileProperties *pProfiles,
+                                                       VkBool32 *pSupported);
+
+// Enable or disable the caching of the capabilities queried from physical devices (disabled by default)
+// Disabling the cache also discards all the capabilities cached so far
+VPAPI_ATTR void vpSetPhysicalDeviceCacheEnabled(VkBool32 enabled);
+
+// Discard the cached capabilities of a physical device of an instance, where VK_NULL_HANDLE matches any instance
+// or physical device, e.g. to discard the capabilities of all the physical devices of an instance before destroying it
+VPAPI_ATTR void vpInvalidatePhysicalDeviceCache(VkInstance instance, VkPhysicalDevice physicalDevice);
+
 // Create a VkDevice with the profile features and device extensions enabled
 VPAPI_ATTR VkResult vpCreateDevice(VkPhysicalDevice physicalDevice, const VpDeviceCreateInfo *pCreateInfo,
                                    const VkAllocationCallbacks *pAllocator, VkDevice *pDevice);
@@ -356,6 +385,25 @@ struct VpStructChainerDesc {
     PFN_vpStructChainer             pfnFormat;
 };
 
+struct VpAlternativeDesc {
+    uint32_t                        group;
+
+    const VkExtensionProperties*    pInstanceExtensions;
+    uint32_t                        instanceExtensionCount;
+
+    const VkExtensionProperties*    pDeviceExtensions;
+    uint32_t                        deviceExtensionCount;
+
+    VpFeatureDesc                   feature;
+    VpPropertyDesc                  property;
+
+    const VpQueueFamilyDesc*        pQueueFamilies;
+    uint32_t                        queueFamilyCount;
+
+    const VpFormatDesc*             pFormats;
+    uint32_t                        formatCount;
+};
+
 struct VpProfileDesc {
     VpProfileProperties             props;
     uint32_t                        minApiVersion;
@@ -388,6 +436,10 @@ struct VpProfileDesc {
     uint32_t                        formatCount;
 
     VpStructChainerDesc             chainers;
+
+    const VpAlternativeDesc*        pAlternatives;
+    uint32_t                        alternativeCount;
+    uint32_t                        alternativeGroupCount;
 };
 
 template <typename T>
@@ -398,8 +450,18 @@ VPAPI_ATTR bool vpCheckFlags(const T& actual, const uint64_t expected) {
 
 PRIVATE_IMPL_BODY = '''
 VPAPI_ATTR const VpProfileDesc* vpGetProfileDesc(const char profileName[VP_MAX_PROFILE_NAME_SIZE]) {
-    for (uint32_t i = 0; i < vpProfileCount; ++i) {
-        if (strncmp(vpProfiles[i].props.profileName, profileName, VP_MAX_PROFILE_NAME_SIZE) == 0) return &vpProfiles[i];
+    // The profiles are sorted by name
+    uint32_t first = 0;
+    uint32_t last = vpProfileCount;
+    while (first < last) {
+        uint32_t middle = first + (last - first) / 2;
+        int comparison = strncmp(vpProfiles[middle].props.profileName, profileName, VP_MAX_PROFILE_NAME_SIZE);
+        if (comparison == 0) return &vpProfiles[middle];
+        if (comparison < 0) {
+            first = middle + 1;
+        } else {
+            last = middle;
+        }
     }
     return nullptr;
 }
@@ -412,16 +474,39 @@ VPAPI_ATTR bool vpCheckVersion(uint32_t actual, uint32_t expected) {
     return actualMajor > expectedMajor || (actualMajor == expectedMajor && actualMinor >= expectedMinor);
 }
 
-VPAPI_ATTR bool vpCheckExtension(const VkExtensionProperties *supportedProperties, size_t supportedSize,
-                                 const char *requestedExtension) {
-    bool found = false;
-    for (size_t i = 0, n = supportedSize; i < n; ++i) {
-        if (strcmp(supportedProperties[i].extensionName, requestedExtension) == 0) {
-            found = true;
-            // Drivers don't actually update their spec version, so we cannot rely on this
-            // if (supportedProperties[i].specVersion >= expectedVersion) found = true;
-        }
+VPAPI_ATTR bool vpExtensionNameLess(const VkExtensionProperties& a, const VkExtensionProperties& b) {
+    return strcmp(a.extensionName, b.extensionName) < 0;
+}
+
+VPAPI_ATTR void vpSortExtensions(std::vector<VkExtensionProperties>& extensions) {
+    // Sorting pointers and copying the extensions once is cheaper than swapping the large structures
+    std::vector<const VkExtensionProperties*> order(extensions.size());
+    for (size_t i = 0; i < extensions.size(); ++i) {
+        order[i] = &extensions[i];
+    }
+    std::sort(order.begin(), order.end(), [](const VkExtensionProperties* a, const VkExtensionProperties* b) {
+        return vpExtensionNameLess(*a, *b);
+    });
+    std::vector<VkExtensionProperties> sorted(extensions.size());
+    for (size_t i = 0; i < order.size(); ++i) {
+        sorted[i] = *order[i];
     }
+    extensions.swap(sorted);
+}
+
+// Binary search of the requested extension, hence sortedSupportedProperties must be sorted by extension
+// name using strcmp, as done by vpSortExtensions and as the extensions of the profiles are generated
+VPAPI_ATTR bool vpCheckExtension(const VkExtensionProperties *sortedSupportedProperties, size_t supportedSize,
+                                 const char *requestedExtension) {
+    const VkExtensionProperties* pEnd = sortedSupportedProperties + supportedSize;
+    VP_DEBUG_COND_MSG(!std::is_sorted(sortedSupportedProperties, pEnd, vpExtensionNameLess), "The extensions passed to vpCheckExtension are not sorted by name");
+    const VkExtensionProperties* pFound = std::lower_bound(sortedSupportedProperties, pEnd, requestedExtension,
+        [](const VkExtensionProperties& properties, const char* name) {
+            return strcmp(properties.extensionName, name) < 0;
+        });
+    bool found = pFound != pEnd && strcmp(pFound->extensionName, requestedExtension) == 0;
+    // Drivers don't actually update their spec version, so we cannot rely on this
+    // if (pFound->specVersion >= expectedVersion) found = true;
     VP_DEBUG_COND_MSGF(!found, "Unsupported extension: %s", requestedExtension);
     return found;
 }
@@ -449,6 +534,112 @@ VPAPI_ATTR void vpGetExtensions(uint32_t requestedExtensionCount, const char *co
     }
 }
 
+VPAPI_ATTR bool vpCheckStructChain(VkBaseOutStructure* p, PFN_vpStructComparator pfnComparator) {
+    bool supported = true;
+    while (p != nullptr) {
+        if (!pfnComparator(p)) {
+            supported = false;
+        }
+        p = p->pNext;
+    }
+    return supported;
+}
+
+struct VpStructChainerContext {
+    VkBaseOutStructure*                         pBase;
+    const std::vector<PFN_vpStructChainer>*     pChainers;
+    size_t                                      index;
+    void*                                       pUser;
+    PFN_vpStructChainerCb                       pfnCb;
+};
+
+VPAPI_ATTR void vpChainStructsCb(VkBaseOutStructure* p, void* pUser) {
+    VpStructChainerContext* pContext = static_cast<VpStructChainerContext*>(pUser);
+    while (p->pNext != nullptr) {
+        p = p->pNext;
+    }
+    if (pContext->index < pContext->pChainers->size()) {
+        // Append the structures of the next chainer to the end of the chain
+        (*pContext->pChainers)[pContext->index++](p, pUser, vpChainStructsCb);
+    } else {
+        // Multiple chainers may chain the same structure type, only the first one is kept
+        for (VkBaseOutStructure* pPrev = pContext->pBase; pPrev->pNext != nullptr;) {
+            bool duplicate = false;
+            for (VkBaseOutStructure* pOther = pContext->pBase; pOther != pPrev->pNext; pOther = pOther->pNext) {
+                if (pOther->sType == pPrev->pNext->sType) {
+                    duplicate = true;
+                    break;
+                }
+            }
+            if (duplicate) {
+                pPrev->pNext = pPrev->pNext->pNext;
+            } else {
+                pPrev = pPrev->pNext;
+            }
+        }
+        pContext->pfnCb(pContext->pBase, pContext->pUser);
+    }
+}
+
+VPAPI_ATTR void vpChainStructs(VkBaseOutStructure* p, const std::vector<PFN_vpStructChainer>& chainers,
+                               void* pUser, PFN_vpStructChainerCb pfnCb) {
+    VpStructChainerContext context{ p, &chainers, 0, pUser, pfnCb };
+    vpChainStructsCb(p, &context);
+}
+
+// Finds an augmenting path from a queue family of the profile to a queue family of the device that
+// is not matched yet, re-matching the profile queue families along the path (Kuhn's algorithm)
+VPAPI_ATTR bool vpMatchQueueFamily(const std::vector<std::vector<bool>>& matches, uint32_t profileIndex,
+                                   std::vector<bool>& visited, std::vector<uint32_t>& deviceMatch) {
+    for (uint32_t i = 0; i < deviceMatch.size(); ++i) {
+        if (!matches[profileIndex][i] || visited[i]) continue;
+        visited[i] = true;
+        if (deviceMatch[i] == UINT32_MAX || vpMatchQueueFamily(matches, deviceMatch[i], visited, deviceMatch)) {
+            deviceMatch[i] = profileIndex;
+            return true;
+        }
+    }
+    return false;
+}
+
+VPAPI_ATTR bool vpCheckQueueFamilies(VkQueueFamilyProperties2KHR* pProps, uint32_t count,
+                                     const std::vector<const VpQueueFamilyDesc*>& queueFamilies) {
+    if (queueFamilies.size() > count) {
+        VP_DEBUG_MSGF("Unsupported number of queue families: device has fewer (%u) than what the profile defines (%u)", count, static_cast<uint32_t>(queueFamilies.size()));
+        return false;
+    }
+
+    // Check first that each queue family defined is supported by the device
+    std::vector<std::vector<bool>> matches(queueFamilies.size(), std::vector<bool>(count, false));
+    for (uint32_t i = 0; i < queueFamilies.size(); ++i) {
+        bool found = false;
+        for (uint32_t j = 0; j < count; ++j) {
+            if (vpCheckStructChain(static_cast<VkBaseOutStructure*>(static_cast<void*>(&pProps[j])), queueFamilies[i]->pfnComparator)) {
+                matches[i][j] = true;
+                found = true;
+            }
+        }
+        if (!found) {
+            VP_DEBUG_MSGF("Unsupported queue family defined at profile data index #%u", i);
+            return false;
+        }
+    }
+
+    // Then find a matching of the queue families to ensure that while order of the queue families
+    // doesn't matter, each queue family property criteria is matched with a separate queue family
+    // of the actual device
+    std::vector<uint32_t> deviceMatch(count, UINT32_MAX);
+    for (uint32_t i = 0; i < queueFamilies.size(); ++i) {
+        std::vector<bool> visited(count, false);
+        if (!vpMatchQueueFamily(matches, i, visited, deviceMatch)) {
+            VP_DEBUG_MSG("Unsupported combination of queue families");
+            return false;
+        }
+    }
+
+    return true;
+}
+
 VPAPI_ATTR const void* vpGetStructure(const void* pNext, VkStructureType type) {
     const VkBaseOutStructure *p = static_cast<const VkBaseOutStructure*>(pNext);
     while (p != nullptr) {
@@ -466,6 +657,247 @@ VPAPI_ATTR void* vpGetStructure(void* pNext, VkStructureType type) {
     }
     return nullptr;
 }
+
+struct VpCachedStruct {
+    VkStructureType                             sType;
+    std::vector<uint8_t>                        data;
+};
+
+struct VpCachedFormat {
+    VkFormat                                    format;
+    std::vector<VpCachedStruct>                 structs;
+};
+
+// Capabilities of a physical device that were already queried from the driver
+struct VpPhysicalDeviceSnapshot {
+    std::mutex                                  mutex;
+    bool                                        hasExtensions = false;
+    std::vector<VkExtensionProperties>          extensions;
+    bool                                        hasProperties = false;
+    VkPhysicalDeviceProperties                  properties{};
+    std::vector<VpCachedStruct>                 featureStructs;
+    std::vector<VpCachedStruct>                 propertyStructs;
+    std::vector<VpCachedFormat>                 formats;
+    bool                                        hasQueueFamilyCount = false;
+    uint32_t                                    queueFamilyCount = 0;
+    std::vector<std::vector<VpCachedStruct>>    queueFamilyStructs;
+};
+
+// Physical device handles are only unique within their instance, and may be reused by a new instance
+struct VpPhysicalDeviceCacheEntry {
+    VkInstance                                  instance;
+    VkPhysicalDevice                            physicalDevice;
+    std::shared_ptr<VpPhysicalDeviceSnapshot>   snapshot;
+};
+
+struct VpPhysicalDeviceCache {
+    std::mutex                                  mutex;
+    bool                                        enabled = false;
+    std::vector<VpPhysicalDeviceCacheEntry>     snapshots;
+};
+
+VPAPI_ATTR VpPhysicalDeviceCache& vpGetPhysicalDeviceCache() {
+    static VpPhysicalDeviceCache cache;
+    return cache;
+}
+
+// Returns the snapshot of the physical device, or nullptr if the cache is disabled. Invalidating the
+// cache only drops its reference to the snapshot so queries in progress can keep using it safely.
+VPAPI_ATTR std::shared_ptr<VpPhysicalDeviceSnapshot> vpGetPhysicalDeviceSnapshot(VkInstance instance, VkPhysicalDevice physicalDevice) {
+    VpPhysicalDeviceCache& cache = vpGetPhysicalDeviceCache();
+    std::lock_guard<std::mutex> lock(cache.mutex);
+    if (!cache.enabled) {
+        return nullptr;
+    }
+    for (const auto& entry : cache.snapshots) {
+        if (entry.instance == instance && entry.physicalDevice == physicalDevice) return entry.snapshot;
+    }
+    cache.snapshots.push_back({ instance, physicalDevice, std::make_shared<VpPhysicalDeviceSnapshot>() });
+    return cache.snapshots.back().snapshot;
+}
+
+VPAPI_ATTR const VpCachedStruct* vpFindCachedStruct(const std::vector<VpCachedStruct>& cachedStructs, VkStructureType type) {
+    for (const auto& cachedStruct : cachedStructs) {
+        if (cachedStruct.sType == type) return &cachedStruct;
+    }
+    return nullptr;
+}
+
+// Fills the structure chain from the cache, the chain is left untouched unless all of its structures are cached
+VPAPI_ATTR bool vpLoadCachedStructs(const std::vector<VpCachedStruct>& cachedStructs, VkBaseOutStructure* p) {
+    for (VkBaseOutStructure* pStruct = p; pStruct != nullptr; pStruct = pStruct->pNext) {
+        if (vpFindCachedStruct(cachedStructs, pStruct->sType) == nullptr) return false;
+    }
+    while (p != nullptr) {
+        const VpCachedStruct* pCachedStruct = vpFindCachedStruct(cachedStructs, p->sType);
+        VkBaseOutStructure* pNext = p->pNext;
+        memcpy(p, pCachedStruct->data.data(), pCachedStruct->data.size());
+        p->pNext = pNext;
+        p = pNext;
+    }
+    return true;
+}
+
+VPAPI_ATTR void vpStoreCachedStructs(std::vector<VpCachedStruct>& cachedStructs, const VkBaseOutStructure* p) {
+    while (p != nullptr) {
+        size_t size = vpGetStructSize(p->sType);
+        if (size > 0 && vpFindCachedStruct(cachedStructs, p->sType) == nullptr) {
+            const uint8_t* pData = static_cast<const uint8_t*>(static_cast<const void*>(p));
+            cachedStructs.push_back({ p->sType, std::vector<uint8_t>(pData, pData + size) });
+        }
+        p = p->pNext;
+    }
+}
+
+VPAPI_ATTR VkResult vpQueryDeviceExtensions(VpPhysicalDeviceSnapshot* pSnapshot, VkPhysicalDevice physicalDevice,
+                                            std::vector<VkExtensionProperties>& ext) {
+    std::unique_lock<std::mutex> lock;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        if (pSnapshot->hasExtensions) {
+            ext = pSnapshot->extensions;
+            return VK_SUCCESS;
+        }
+    }
+
+    uint32_t extCount = 0;
+    VkResult result = vkEnumerateDeviceExtensionProperties(physicalDevice, nullptr, &extCount, nullptr);
+    if (result != VK_SUCCESS) {
+        return result;
+    }
+    if (extCount > 0) {
+        ext.resize(extCount);
+    }
+    result = vkEnumerateDeviceExtensionProperties(physicalDevice, nullptr, &extCount, ext.data());
+    if (result != VK_SUCCESS) {
+        return result;
+    }
+
+    // Workaround old loader bug where count could be smaller on the second call to vkEnumerateDeviceExtensionProperties
+    if (extCount > 0) {
+        ext.resize(extCount);
+    }
+    vpSortExtensions(ext);
+
+    if (pSnapshot != nullptr) {
+        pSnapshot->extensions = ext;
+        pSnapshot->hasExtensions = true;
+    }
+    return result;
+}
+
+VPAPI_ATTR void vpQueryDeviceProperties(VpPhysicalDeviceSnapshot* pSnapshot, VkPhysicalDevice physicalDevice,
+                                        VkPhysicalDeviceProperties* pProperties) {
+    std::unique_lock<std::mutex> lock;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        if (pSnapshot->hasProperties) {
+            *pProperties = pSnapshot->properties;
+            return;
+        }
+    }
+
+    vkGetPhysicalDeviceProperties(physicalDevice, pProperties);
+
+    if (pSnapshot != nullptr) {
+        pSnapshot->properties = *pProperties;
+        pSnapshot->hasProperties = true;
+    }
+}
+
+VPAPI_ATTR void vpQueryFeatures(VpPhysicalDeviceSnapshot* pSnapshot,
+                                PFN_vkGetPhysicalDeviceFeatures2KHR pfnGetPhysicalDeviceFeatures2,
+                                VkPhysicalDevice physicalDevice, VkBaseOutStructure* p) {
+    std::unique_lock<std::mutex> lock;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        if (vpLoadCachedStructs(pSnapshot->featureStructs, p)) return;
+    }
+
+    pfnGetPhysicalDeviceFeatures2(physicalDevice, static_cast<VkPhysicalDeviceFeatures2KHR*>(static_cast<void*>(p)));
+
+    if (pSnapshot != nullptr) {
+        vpStoreCachedStructs(pSnapshot->featureStructs, p);
+    }
+}
+
+VPAPI_ATTR void vpQueryProperties(VpPhysicalDeviceSnapshot* pSnapshot,
+                                  PFN_vkGetPhysicalDeviceProperties2KHR pfnGetPhysicalDeviceProperties2,
+                                  VkPhysicalDevice physicalDevice, VkBaseOutStructure* p) {
+    std::unique_lock<std::mutex> lock;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        if (vpLoadCachedStructs(pSnapshot->propertyStructs, p)) return;
+    }
+
+    pfnGetPhysicalDeviceProperties2(physicalDevice, static_cast<VkPhysicalDeviceProperties2KHR*>(static_cast<void*>(p)));
+
+    if (pSnapshot != nullptr) {
+        vpStoreCachedStructs(pSnapshot->propertyStructs, p);
+    }
+}
+
+VPAPI_ATTR void vpQueryFormatProperties(VpPhysicalDeviceSnapshot* pSnapshot,
+                                        PFN_vkGetPhysicalDeviceFormatProperties2KHR pfnGetPhysicalDeviceFormatProperties2,
+                                        VkPhysicalDevice physicalDevice, VkFormat format, VkBaseOutStructure* p) {
+    std::unique_lock<std::mutex> lock;
+    VpCachedFormat* pCachedFormat = nullptr;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        for (auto& cachedFormat : pSnapshot->formats) {
+            if (cachedFormat.format == format) {
+                pCachedFormat = &cachedFormat;
+                break;
+            }
+        }
+        if (pCachedFormat == nullptr) {
+            pSnapshot->formats.push_back({ format, {} });
+            pCachedFormat = &pSnapshot->formats.back();
+        }
+        if (vpLoadCachedStructs(pCachedFormat->structs, p)) return;
+    }
+
+    pfnGetPhysicalDeviceFormatProperties2(physicalDevice, format, static_cast<VkFormatProperties2KHR*>(static_cast<void*>(p)));
+
+    if (pCachedFormat != nullptr) {
+        vpStoreCachedStructs(pCachedFormat->structs, p);
+    }
+}
+
+VPAPI_ATTR void vpQueryQueueFamilyProperties(VpPhysicalDeviceSnapshot* pSnapshot,
+                                             PFN_vkGetPhysicalDeviceQueueFamilyProperties2KHR pfnGetPhysicalDeviceQueueFamilyProperties2,
+                                             VkPhysicalDevice physicalDevice, uint32_t* pCount, VkQueueFamilyProperties2KHR* pProps) {
+    std::unique_lock<std::mutex> lock;
+    if (pSnapshot != nullptr) {
+        lock = std::unique_lock<std::mutex>(pSnapshot->mutex);
+        if (pProps == nullptr) {
+            if (pSnapshot->hasQueueFamilyCount) {
+                *pCount = pSnapshot->queueFamilyCount;
+                return;
+            }
+        } else if (pSnapshot->queueFamilyStructs.size() == *pCount) {
+            bool cached = true;
+            for (uint32_t i = 0; i < *pCount && cached; ++i) {
+                cached = vpLoadCachedStructs(pSnapshot->queueFamilyStructs[i], static_cast<VkBaseOutStructure*>(static_cast<void*>(&pProps[i])));
+            }
+            if (cached) return;
+        }
+    }
+
+    pfnGetPhysicalDeviceQueueFamilyProperties2(physicalDevice, pCount, pProps);
+
+    if (pSnapshot != nullptr) {
+        if (pProps == nullptr) {
+            pSnapshot->queueFamilyCount = *pCount;
+            pSnapshot->hasQueueFamilyCount = true;
+        } else {
+            pSnapshot->queueFamilyStructs.resize(*pCount);
+            for (uint32_t i = 0; i < *pCount; ++i) {
+                vpStoreCachedStructs(pSnapshot->queueFamilyStructs[i], static_cast<const VkBaseOutStructure*>(static_cast<const void*>(&pProps[i])));
+            }
+        }
+    }
+}
 '''
 
 PUBLIC_IMPL_BODY = '''
@@ -531,6 +963,7 @@ VPAPI_ATTR VkResult vpGetInstanceProfileSupport(const char *pLayerName, const Vp
     if (result != VK_SUCCESS) {
         return result;
     }
+    detail::vpSortExtensions(ext);
 
     const detail::VpProfileDesc* pDesc = detail::vpGetProfileDesc(pProfile->profileName);
     if (pDesc == nullptr) return VK_ERROR_UNKNOWN;
@@ -554,6 +987,26 @@ VPAPI_ATTR VkResult vpGetInstanceProfileSupport(const char *pLayerName, const Vp
         }
     }
 
+    // Each group of alternatives needs at least one alternative with all of its instance extensions supported
+    for (uint32_t group = 0; group < pDesc->alternativeGroupCount; ++group) {
+        bool found = false;
+        for (uint32_t i = 0; i < pDesc->alternativeCount && !found; ++i) {
+            const detail::VpAlternativeDesc& alternative = pDesc->pAlternatives[i];
+            if (alternative.group != group) continue;
+            found = true;
+            for (uint32_t j = 0; j < alternative.instanceExtensionCount; ++j) {
+                if (!detail::vpCheckExtension(ext.data(), ext.size(),
+                    alternative.pInstanceExtensions[j].extensionName)) {
+                    found = false;
+                }
+            }
+        }
+        if (!found) {
+            VP_DEBUG_MSGF("Unsupported instance extensions for all alternatives of group #%u", group);
+            *pSupported = VK_FALSE;
+        }
+    }
+
     // We require VK_KHR_get_physical_device_properties2 if we are on Vulkan 1.0
     if (apiVersion < VK_API_VERSION_1_1) {
         bool foundGPDP2 = false;
@@ -644,32 +1097,26 @@ VPAPI_ATTR VkResult vpCreateInstance(const VpInstanceCreateInfo *pCreateInfo,
     return vkCreateInstance(pInstanceCreateInfo, pAllocator, pInstance);
 }
 
-VPAPI_ATTR VkResult vpGetPhysicalDeviceProfileSupport(VkInstance instance, VkPhysicalDevice physicalDevice,
-                                                      const VpProfileProperties *pProfile, VkBool32 *pSupported) {
+VPAPI_ATTR VkResult vpGetPhysicalDeviceProfilesSupport(VkInstance instance, VkPhysicalDevice physicalDevice,
+                                                       uint32_t profileCount, const VpProfileProperties *pProfiles,
+                                                       VkBool32 *pSupported) {
     VkResult result = VK_SUCCESS;
 
-    uint32_t extCount = 0;
-    result = vkEnumerateDeviceExtensionProperties(physicalDevice, nullptr, &extCount, nullptr);
-    if (result != VK_SUCCESS) {
-        return result;
-    }
+    // Capabilities are only queried from the driver once per physical device while the cache is enabled
+    std::shared_ptr<detail::VpPhysicalDeviceSnapshot> snapshot = detail::vpGetPhysicalDeviceSnapshot(instance, physicalDevice);
+
     std::vector<VkExtensionProperties> ext;
-    if (extCount > 0) {
-        ext.resize(extCount);
-    }
-    result = vkEnumerateDeviceExtensionProperties(physicalDevice, nullptr, &extCount, ext.data());
+    result = detail::vpQueryDeviceExtensions(snapshot.get(), physicalDevice, ext);
     if (result != VK_SUCCESS) {
         return result;
     }
 
-    // Workaround old loader bug where count could be smaller on the second call to vkEnumerateDeviceExtensionProperties
-    if (extCount > 0) {
-        ext.resize(extCount);
+    std::vector<const detail::VpProfileDesc*> descs(profileCount);
+    for (uint32_t i = 0; i < profileCount; ++i) {
+        descs[i] = detail::vpGetProfileDesc(pProfiles[i].profileName);
+        if (descs[i] == nullptr) return VK_ERROR_UNKNOWN;
     }
 
-    const detail::VpProfileDesc* pDesc = detail::vpGetProfileDesc(pProfile->profileName);
-    if (pDesc == nullptr) return VK_ERROR_UNKNOWN;
-
     struct GPDP2EntryPoints {
         PFN_vkGetPhysicalDeviceFeatures2KHR                 pfnGetPhysicalDeviceFeatures2;
         PFN_vkGetPhysicalDeviceProperties2KHR               pfnGetPhysicalDeviceProperties2;
@@ -677,15 +1124,31 @@ VPAPI_ATTR VkResult vpGetPhysicalDeviceProfileSupport(VkInstance instance, VkPhy
         PFN_vkGetPhysicalDeviceQueueFamilyProperties2KHR    pfnGetPhysicalDeviceQueueFamilyProperties2;
     };
 
+    struct FormatCheck {
+        VkFormat                            format;
+        uint32_t                            profile;
+        uint32_t                            alternative;
+        const detail::VpFormatDesc*         pFormat;
+    };
+
+    // All profiles are checked against the same device queries: the structures needed by any of the
+    // profiles are chained together and each profile only evaluates the structures it defines
     struct UserData {
-        VkPhysicalDevice                    physicalDevice;
-        const detail::VpProfileDesc*        pDesc;
-        GPDP2EntryPoints                    gpdp2;
-        uint32_t                            index;
-        uint32_t                            count;
-        detail::PFN_vpStructChainerCb       pfnCb;
-        bool                                supported;
-    } userData{ physicalDevice, pDesc };
+        VkPhysicalDevice                            physicalDevice;
+        detail::VpPhysicalDeviceSnapshot*           pSnapshot;
+        const detail::VpProfileDesc* const*         ppDescs;
+        uint32_t                                    profileCount;
+        VkBool32*                                   pSupported;
+        GPDP2EntryPoints                            gpdp2;
+        const FormatCheck*                          pFormatChecks;
+        uint32_t                                    formatCheckCount;
+        VkQueueFamilyProperties2KHR*                pQueueFamilyProps;
+        uint32_t                                    index;
+        uint32_t                                    count;
+        detail::PFN_vpStructChainerCb               pfnCb;
+        std::vector<detail::PFN_vpStructChainer>    chainers;
+        std::vector<std::vector<bool>>              alternativeSupported;
+    } userData{ physicalDevice, snapshot.get(), descs.data(), profileCount, pSupported };
 
     // Attempt to load core versions of the GPDP2 entry points
     userData.gpdp2.pfnGetPhysicalDeviceFeatures2 =
@@ -716,186 +1179,255 @@ VPAPI_ATTR VkResult vpGetPhysicalDeviceProfileSupport(VkInstance instance, VkPhy
         return VK_ERROR_EXTENSION_NOT_PRESENT;
     }
 
-    *pSupported = VK_TRUE;
-    VP_DEBUG_MSGF("Checking device support for profile %s (%s). You may find the details of the capabilities of this device on https://vulkan.gpuinfo.org/", pProfile->profileName, detail::vpGetDeviceAndDriverInfoString(physicalDevice, userData.gpdp2.pfnGetPhysicalDeviceProperties2).c_str());
+    VkPhysicalDeviceProperties deviceProps{};
+    detail::vpQueryDeviceProperties(snapshot.get(), physicalDevice, &deviceProps);
 
-    if (pDesc->props.specVersion < pProfile->specVersion) {
-        VP_DEBUG_MSGF("Unsupported profile version: %u", pProfile->specVersion);
-        *pSupported = VK_FALSE;
-    }
+    // The capabilities common to the alternatives of a group are part of the profile's own data,
+    // so the alternatives are checked against the same queried structures but with the
+    // comparators of their specific requirements
+    userData.alternativeSupported.resize(profileCount);
+    const std::string deviceInfo = detail::vpGetDeviceAndDriverInfoString(physicalDevice, userData.gpdp2.pfnGetPhysicalDeviceProperties2); // Only used by VP_DEBUG messages
 
-    {
-        VkPhysicalDeviceProperties props{};
-        vkGetPhysicalDeviceProperties(physicalDevice, &props);
-        if (!detail::vpCheckVersion(props.apiVersion, pDesc->minApiVersion)) {
+    for (uint32_t i = 0; i < profileCount; ++i) {
+        const detail::VpProfileDesc* pDesc = descs[i];
+        pSupported[i] = VK_TRUE;
+        userData.alternativeSupported[i].resize(pDesc->alternativeCount, true);
+        VP_DEBUG_MSGF("Checking device support for profile %s (%s). You may find the details of the capabilities of this device on https://vulkan.gpuinfo.org/", pProfiles[i].profileName, deviceInfo.c_str());
+
+        if (pDesc->props.specVersion < pProfiles[i].specVersion) {
+            VP_DEBUG_MSGF("Unsupported profile version: %u", pProfiles[i].specVersion);
+            pSupported[i] = VK_FALSE;
+        }
+
+        if (!detail::vpCheckVersion(deviceProps.apiVersion, pDesc->minApiVersion)) {
             VP_DEBUG_MSGF("Unsupported API version: %u.%u.%u", VK_API_VERSION_MAJOR(pDesc->minApiVersion), VK_API_VERSION_MINOR(pDesc->minApiVersion), VK_API_VERSION_PATCH(pDesc->minApiVersion));
-            *pSupported = VK_FALSE;
+            pSupported[i] = VK_FALSE;
         }
-    }
 
-    for (uint32_t i = 0; i < pDesc->deviceExtensionCount; ++i) {
-        if (!detail::vpCheckExtension(ext.data(), ext.size(),
-            pDesc->pDeviceExtensions[i].extensionName)) {
-            *pSupported = VK_FALSE;
+        for (uint32_t j = 0; j < pDesc->deviceExtensionCount; ++j) {
+            if (!detail::vpCheckExtension(ext.data(), ext.size(),
+                pDesc->pDeviceExtensions[j].extensionName)) {
+                pSupported[i] = VK_FALSE;
+            }
+        }
+
+        for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+            for (uint32_t k = 0; k < pDesc->pAlternatives[j].deviceExtensionCount; ++k) {
+                if (!detail::vpCheckExtension(ext.data(), ext.size(),
+                    pDesc->pAlternatives[j].pDeviceExtensions[k].extensionName)) {
+                    userData.alternativeSupported[i][j] = false;
+                }
+            }
         }
     }
 
     {
+        userData.chainers.clear();
+        for (uint32_t i = 0; i < profileCount; ++i) {
+            userData.chainers.push_back(descs[i]->chainers.pfnFeature);
+        }
         VkPhysicalDeviceFeatures2KHR features{ VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_FEATURES_2_KHR };
-        pDesc->chainers.pfnFeature(static_cast<VkBaseOutStructure*>(static_cast<void*>(&features)), &userData,
+        detail::vpChainStructs(static_cast<VkBaseOutStructure*>(static_cast<void*>(&features)), userData.chainers, &userData,
             [](VkBaseOutStructure* p, void* pUser) {
                 UserData* pUserData = static_cast<UserData*>(pUser);
-                pUserData->gpdp2.pfnGetPhysicalDeviceFeatures2(pUserData->physicalDevice,
-                                                               static_cast<VkPhysicalDeviceFeatures2KHR*>(static_cast<void*>(p)));
-                pUserData->supported = true;
-                while (p != nullptr) {
-                    if (!pUserData->pDesc->feature.pfnComparator(p)) {
-                        pUserData->supported = false;
+                detail::vpQueryFeatures(pUserData->pSnapshot, pUserData->gpdp2.pfnGetPhysicalDeviceFeatures2,
+                                        pUserData->physicalDevice, p);
+                for (uint32_t i = 0; i < pUserData->profileCount; ++i) {
+                    const detail::VpProfileDesc* pDesc = pUserData->ppDescs[i];
+                    if (!detail::vpCheckStructChain(p, pDesc->feature.pfnComparator)) {
+                        pUserData->pSupported[i] = VK_FALSE;
+                    }
+                    for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+                        if (pUserData->alternativeSupported[i][j] &&
+                            !detail::vpCheckStructChain(p, pDesc->pAlternatives[j].feature.pfnComparator)) {
+                            pUserData->alternativeSupported[i][j] = false;
+                        }
                     }
-                    p = p->pNext;
                 }
             }
         );
-        if (!userData.supported) {
-            *pSupported = VK_FALSE;
-        }
     }
 
     {
+        userData.chainers.clear();
+        for (uint32_t i = 0; i < profileCount; ++i) {
+            userData.chainers.push_back(descs[i]->chainers.pfnProperty);
+        }
         VkPhysicalDeviceProperties2KHR props{ VK_STRUCTURE_TYPE_PHYSICAL_DEVICE_PROPERTIES_2_KHR };
-        pDesc->chainers.pfnProperty(static_cast<VkBaseOutStructure*>(static_cast<void*>(&props)), &userData,
+        detail::vpChainStructs(static_cast<VkBaseOutStructure*>(static_cast<void*>(&props)), userData.chainers, &userData,
             [](VkBaseOutStructure* p, void* pUser) {
                 UserData* pUserData = static_cast<UserData*>(pUser);
-                pUserData->gpdp2.pfnGetPhysicalDeviceProperties2(pUserData->physicalDevice,
-                                                                 static_cast<VkPhysicalDeviceProperties2KHR*>(static_cast<void*>(p)));
-                pUserData->supported = true;
-                while (p != nullptr) {
-                    if (!pUserData->pDesc->property.pfnComparator(p)) {
-                        pUserData->supported = false;
+                detail::vpQueryProperties(pUserData->pSnapshot, pUserData->gpdp2.pfnGetPhysicalDeviceProperties2,
+                                          pUserData->physicalDevice, p);
+                for (uint32_t i = 0; i < pUserData->profileCount; ++i) {
+                    const detail::VpProfileDesc* pDesc = pUserData->ppDescs[i];
+                    if (!detail::vpCheckStructChain(p, pDesc->property.pfnComparator)) {
+                        pUserData->pSupported[i] = VK_FALSE;
+                    }
+                    for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+                        if (pUserData->alternativeSupported[i][j] &&
+                            !detail::vpCheckStructChain(p, pDesc->pAlternatives[j].property.pfnComparator)) {
+                            pUserData->alternativeSupported[i][j] = false;
+                        }
                     }
-                    p = p->pNext;
                 }
             }
         );
-        if (!userData.supported) {
-            *pSupported = VK_FALSE;
-        }
     }
 
-    for (uint32_t i = 0; i < pDesc->formatCount; ++i) {
-        userData.index = i;
-        VkFormatProperties2KHR props{ VK_STRUCTURE_TYPE_FORMAT_PROPERTIES_2_KHR };
-        pDesc->chainers.pfnFormat(static_cast<VkBaseOutStructure*>(static_cast<void*>(&props)), &userData,
-            [](VkBaseOutStructure* p, void* pUser) {
-                UserData* pUserData = static_cast<UserData*>(pUser);
-                pUserData->gpdp2.pfnGetPhysicalDeviceFormatProperties2(pUserData->physicalDevice,
-                                                                       pUserData->pDesc->pFormats[pUserData->index].format,
-                                                                       static_cast<VkFormatProperties2KHR*>(static_cast<void*>(p)));
-                pUserData->supported = true;
-                while (p != nullptr) {
-                    if (!pUserData->pDesc->pFormats[pUserData->index].pfnComparator(p)) {
-                        pUserData->supported = false;
-                    }
-                    p = p->pNext;
+    {
+        // Each format is queried once, with the structures needed by all the profiles checking it
+        std::vector<FormatCheck> formatChecks;
+        for (uint32_t i = 0; i < profileCount; ++i) {
+            const detail::VpProfileDesc* pDesc = descs[i];
+            for (uint32_t j = 0; j < pDesc->formatCount; ++j) {
+                formatChecks.push_back({ pDesc->pFormats[j].format, i, UINT32_MAX, &pDesc->pFormats[j] });
+            }
+            for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+                for (uint32_t k = 0; k < pDesc->pAlternatives[j].formatCount; ++k) {
+                    formatChecks.push_back({ pDesc->pAlternatives[j].pFormats[k].format, i, j, &pDesc->pAlternatives[j].pFormats[k] });
                 }
             }
-        );
-        if (!userData.supported) {
-            *pSupported = VK_FALSE;
+        }
+        std::stable_sort(formatChecks.begin(), formatChecks.end(), [](const FormatCheck& a, const FormatCheck& b) {
+            return a.format < b.format;
+        });
+
+        for (size_t first = 0, last = 0; first < formatChecks.size(); first = last) {
+            userData.chainers.clear();
+            for (last = first; last < formatChecks.size() && formatChecks[last].format == formatChecks[first].format; ++last) {
+                if (last == first || formatChecks[last].profile != formatChecks[last - 1].profile) {
+                    userData.chainers.push_back(descs[formatChecks[last].profile]->chainers.pfnFormat);
+                }
+            }
+            userData.pFormatChecks = &formatChecks[first];
+            userData.formatCheckCount = static_cast<uint32_t>(last - first);
+
+            VkFormatProperties2KHR props{ VK_STRUCTURE_TYPE_FORMAT_PROPERTIES_2_KHR };
+            detail::vpChainStructs(static_cast<VkBaseOutStructure*>(static_cast<void*>(&props)), userData.chainers, &userData,
+                [](VkBaseOutStructure* p, void* pUser) {
+                    UserData* pUserData = static_cast<UserData*>(pUser);
+                    detail::vpQueryFormatProperties(pUserData->pSnapshot, pUserData->gpdp2.pfnGetPhysicalDeviceFormatProperties2,
+                                                    pUserData->physicalDevice, pUserData->pFormatChecks[0].format, p);
+                    for (uint32_t i = 0; i < pUserData->formatCheckCount; ++i) {
+                        const FormatCheck& check = pUserData->pFormatChecks[i];
+                        if (!detail::vpCheckStructChain(p, check.pFormat->pfnComparator)) {
+                            if (check.alternative == UINT32_MAX) {
+                                pUserData->pSupported[check.profile] = VK_FALSE;
+                            } else {
+                                pUserData->alternativeSupported[check.profile][check.alternative] = false;
+                            }
+                        }
+                    }
+                }
+            );
         }
     }
 
     {
-        userData.gpdp2.pfnGetPhysicalDeviceQueueFamilyProperties2(physicalDevice, &userData.count, nullptr);
+        userData.chainers.clear();
+        for (uint32_t i = 0; i < profileCount; ++i) {
+            userData.chainers.push_back(descs[i]->chainers.pfnQueueFamily);
+        }
+        detail::vpQueryQueueFamilyProperties(snapshot.get(), userData.gpdp2.pfnGetPhysicalDeviceQueueFamilyProperties2,
+                                             physicalDevice, &userData.count, nullptr);
         std::vector<VkQueueFamilyProperties2KHR> props(userData.count, { VK_STRUCTURE_TYPE_QUEUE_FAMILY_PROPERTIES_2_KHR });
+        userData.pQueueFamilyProps = props.data();
         userData.index = 0;
 
         detail::PFN_vpStructChainerCb callback = [](VkBaseOutStructure* p, void* pUser) {
             UserData* pUserData = static_cast<UserData*>(pUser);
-            VkQueueFamilyProperties2KHR* pProps = static_cast<VkQueueFamilyProperties2KHR*>(static_cast<void*>(p));
             if (++pUserData->index < pUserData->count) {
-                pUserData->pDesc->chainers.pfnQueueFamily(static_cast<VkBaseOutStructure*>(static_cast<void*>(++pProps)),
-                                                          pUser, pUserData->pfnCb);
+                p = static_cast<VkBaseOutStructure*>(static_cast<void*>(&pUserData->pQueueFamilyProps[pUserData->index]));
+                detail::vpChainStructs(p, pUserData->chainers, pUser, pUserData->pfnCb);
             } else {
-                pProps -= pUserData->count - 1;
-                pUserData->gpdp2.pfnGetPhysicalDeviceQueueFamilyProperties2(pUserData->physicalDevice,
-                                                                            &pUserData->count,
-                                                                            pProps);
-                pUserData->supported = true;
-
-                // Check first that each queue family defined is supported by the device
-                for (uint32_t i = 0; i < pUserData->pDesc->queueFamilyCount; ++i) {
-                    bool found = false;
-                    for (uint32_t j = 0; j < pUserData->count; ++j) {
-                        bool propsMatch = true;
-                        p = static_cast<VkBaseOutStructure*>(static_cast<void*>(&pProps[j]));
-                        while (p != nullptr) {
-                            if (!pUserData->pDesc->pQueueFamilies[i].pfnComparator(p)) {
-                                propsMatch = false;
-                                break;
-                            }
-                            p = p->pNext;
-                        }
-                        if (propsMatch) {
-                            found = true;
-                            break;
-                        }
+                detail::vpQueryQueueFamilyProperties(pUserData->pSnapshot, pUserData->gpdp2.pfnGetPhysicalDeviceQueueFamilyProperties2,
+                                                     pUserData->physicalDevice, &pUserData->count, pUserData->pQueueFamilyProps);
+
+                for (uint32_t i = 0; i < pUserData->profileCount; ++i) {
+                    const detail::VpProfileDesc* pDesc = pUserData->ppDescs[i];
+
+                    // The queue families required by an alternative have to be matched together with the
+                    // queue families required by the profile itself
+                    std::vector<const detail::VpQueueFamilyDesc*> queueFamilies;
+                    for (uint32_t j = 0; j < pDesc->queueFamilyCount; ++j) {
+                        queueFamilies.push_back(&pDesc->pQueueFamilies[j]);
                     }
-                    if (!found) {
-                        VP_DEBUG_MSGF("Unsupported queue family defined at profile data index #%u", i);
-                        pUserData->supported = false;
-                        return;
+                    if (!detail::vpCheckQueueFamilies(pUserData->pQueueFamilyProps, pUserData->count, queueFamilies)) {
+                        pUserData->pSupported[i] = VK_FALSE;
                     }
-                }
 
-                // Then check each permutation to ensure that while order of the queue families
-                // doesn't matter, each queue family property criteria is matched with a separate
-                // queue family of the actual device
-                std::vector<uint32_t> permutation(pUserData->count);
-                for (uint32_t i = 0; i < pUserData->count; ++i) {
-                    permutation[i] = i;
-                }
-                bool found = false;
-                do {
-                    bool propsMatch = true;
-                    for (uint32_t i = 0; i < pUserData->pDesc->queueFamilyCount && propsMatch; ++i) {
-                        p = static_cast<VkBaseOutStructure*>(static_cast<void*>(&pProps[permutation[i]]));
-                        while (p != nullptr) {
-                            if (!pUserData->pDesc->pQueueFamilies[i].pfnComparator(p)) {
-                                propsMatch = false;
-                                break;
-                            }
-                            p = p->pNext;
+                    for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+                        const detail::VpAlternativeDesc& alternative = pDesc->pAlternatives[j];
+                        if (alternative.queueFamilyCount == 0 || !pUserData->alternativeSupported[i][j]) continue;
+                        std::vector<const detail::VpQueueFamilyDesc*> alternativeQueueFamilies(queueFamilies);
+                        for (uint32_t k = 0; k < alternative.queueFamilyCount; ++k) {
+                            alternativeQueueFamilies.push_back(&alternative.pQueueFamilies[k]);
+                        }
+                        if (!detail::vpCheckQueueFamilies(pUserData->pQueueFamilyProps, pUserData->count, alternativeQueueFamilies)) {
+                            pUserData->alternativeSupported[i][j] = false;
                         }
                     }
-                    if (propsMatch) {
-                        found = true;
-                        break;
-                    }
-                } while (std::next_permutation(permutation.begin(), permutation.end()));
-
-                if (!found) {
-                    VP_DEBUG_MSG("Unsupported combination of queue families");
-                    pUserData->supported = false;
                 }
             }
         };
         userData.pfnCb = callback;
 
-        if (userData.count >= userData.pDesc->queueFamilyCount) {
-            pDesc->chainers.pfnQueueFamily(static_cast<VkBaseOutStructure*>(static_cast<void*>(props.data())), &userData, callback);
-            if (!userData.supported) {
-                *pSupported = VK_FALSE;
-            }
+        if (userData.count > 0) {
+            detail::vpChainStructs(static_cast<VkBaseOutStructure*>(static_cast<void*>(props.data())), userData.chainers, &userData, callback);
         } else {
-            VP_DEBUG_MSGF("Unsupported number of queue families: device has fewer (%u) than what the profile defines (%u)", userData.count, userData.pDesc->queueFamilyCount);
-            *pSupported = VK_FALSE;
+            callback(nullptr, &userData);
+        }
+    }
+
+    // Each group of alternatives needs at least one supported alternative
+    for (uint32_t i = 0; i < profileCount; ++i) {
+        const detail::VpProfileDesc* pDesc = descs[i];
+        for (uint32_t group = 0; group < pDesc->alternativeGroupCount; ++group) {
+            bool found = false;
+            for (uint32_t j = 0; j < pDesc->alternativeCount; ++j) {
+                if (pDesc->pAlternatives[j].group == group && userData.alternativeSupported[i][j]) {
+                    found = true;
+                    break;
+                }
+            }
+            if (!found) {
+                VP_DEBUG_MSGF("Unsupported capabilities for all alternatives of group #%u of profile %s", group, pProfiles[i].profileName);
+                pSupported[i] = VK_FALSE;
+            }
         }
     }
 
     return result;
 }
 
+VPAPI_ATTR VkResult vpGetPhysicalDeviceProfileSupport(VkInstance instance, VkPhysicalDevice physicalDevice,
+                                                      const VpProfileProperties *pProfile, VkBool32 *pSupported) {
+    return vpGetPhysicalDeviceProfilesSupport(instance, physicalDevice, 1, pProfile, pSupported);
+}
+
+VPAPI_ATTR void vpSetPhysicalDeviceCacheEnabled(VkBool32 enabled) {
+    detail::VpPhysicalDeviceCache& cache = detail::vpGetPhysicalDeviceCache();
+    std::lock_guard<std::mutex> lock(cache.mutex);
+    cache.enabled = enabled == VK_TRUE;
+    if (!cache.enabled) {
+        cache.snapshots.clear();
+    }
+}
+
+VPAPI_ATTR void vpInvalidatePhysicalDeviceCache(VkInstance instance, VkPhysicalDevice physicalDevice) {
+    detail::VpPhysicalDeviceCache& cache = detail::vpGetPhysicalDeviceCache();
+    std::lock_guard<std::mutex> lock(cache.mutex);
+    for (auto it = cache.snapshots.begin(); it != cache.snapshots.end();) {
+        if ((instance == VK_NULL_HANDLE || it->instance == instance) &&
+            (physicalDevice == VK_NULL_HANDLE || it->physicalDevice == physicalDevice)) {
+            it = cache.snapshots.erase(it);
+        } else {
+            ++it;
+        }
+    }
+}
+
 VPAPI_ATTR VkResult vpCreateDevice(VkPhysicalDevice physicalDevice, const VpDeviceCreateInfo *pCreateInfo,
                                    const VkAllocationCallbacks *pAllocator, VkDevice *pDevice) {
     if (physicalDevice == VK_NULL_HANDLE || pCreateInfo == nullptr || pDevice == nullptr) {
@@ -1279,16 +1811,21 @@ class Log():
 
 
 class VulkanPlatform():
+    __slots__ = [ 'name', 'protect' ]
+
     def __init__(self, data):
         self.name = data.get('name')
         self.protect = data.get('protect')
 
 
 class VulkanStructMember():
+    __slots__ = [ 'name', 'type', 'limittype', 'isArray', 'arraySizeMember', 'nullTerminated', 'arraySize' ]
+
     def __init__(self, name, type, limittype, isArray = False):
-        self.name = name
-        self.type = type
-        self.limittype = limittype
+        # Member names, types, and limit types repeat across thousands of members, so intern them
+        self.name = sys.intern(name)
+        self.type = sys.intern(type)
+        self.limittype = sys.intern(limittype) if limittype != None else None
         self.isArray = isArray
         self.arraySizeMember = None
         self.nullTerminated = False
@@ -1296,6 +1833,8 @@ class VulkanStructMember():
 
 
 class VulkanStruct():
+    __slots__ = [ 'name', 'sType', 'extends', 'members', 'aliases', 'isAlias', 'definedByVersion', 'definedByExtensions' ]
+
     def __init__(self, name):
         self.name = name
         self.sType = None
@@ -1308,6 +1847,8 @@ class VulkanStruct():
 
 
 class VulkanEnum():
+    __slots__ = [ 'name', 'aliases', 'isAlias', 'values', 'aliasValues' ]
+
     def __init__(self, name):
         self.name = name
         self.aliases = [ name ]
@@ -1317,6 +1858,8 @@ class VulkanEnum():
 
 
 class VulkanBitmask():
+    __slots__ = [ 'name', 'aliases', 'isAlias', 'bitsType' ]
+
     def __init__(self, name):
         self.name = name
         self.aliases = [ name ]
@@ -1325,18 +1868,24 @@ class VulkanBitmask():
 
 
 class VulkanFeature():
+    __slots__ = [ 'name', 'structs' ]
+
     def __init__(self, name):
         self.name = name
         self.structs = set()
 
 
 class VulkanLimit():
+    __slots__ = [ 'name', 'structs' ]
+
     def __init__(self, name):
         self.name = name
         self.structs = set()
 
 
 class VulkanVersionNumber():
+    __slots__ = [ 'major', 'minor', 'patch', 'define' ]
+
     def __init__(self, versionStr):
         match = re.search(r"^([1-9][0-9]*)\.([0-9]+)$", versionStr)
         if match != None:
@@ -1392,6 +1941,17 @@ class VulkanVersionNumber():
 
 
 class VulkanDefinitionScope():
+    # The features and limits of a scope are set when the registry loads its 'features' section,
+    # which the scope keeps a reference to the registry for until then
+    __slots__ = [ 'sTypeAliases', 'registry' ]
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, which includes features and limits not loaded yet
+        if name in [ 'features', 'limits' ] and self.registry != None:
+            self.registry.loadSection('features')
+            return object.__getattribute__(self, name)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
     def parseAliases(self, xml):
         self.sTypeAliases = dict()
         for sTypeAlias in xml.findall("./require/enum[@alias]"):
@@ -1400,22 +1960,27 @@ class VulkanDefinitionScope():
 
 
 class VulkanVersion(VulkanDefinitionScope):
-    def __init__(self, xml):
+    __slots__ = [ 'name', 'number', 'extensions', 'features', 'limits' ]
+
+    def __init__(self, xml, registry):
         self.name = xml.get('name')
         self.number = VulkanVersionNumber(xml.get('number'))
         self.extensions = []
-        self.features = dict()
-        self.limits = dict()
+        self.registry = registry
         self.parseAliases(xml)
 
 
 class VulkanExtension(VulkanDefinitionScope):
-    def __init__(self, xml, upperCaseName):
+    __slots__ = [
+        'name', 'upperCaseName', 'type', 'features', 'limits', 'platform', 'provisional', 'promotedTo',
+        'obsoletedBy', 'deprecatedBy', 'spec_version'
+    ]
+
+    def __init__(self, xml, upperCaseName, registry):
         self.name = xml.get('name')
         self.upperCaseName = upperCaseName
         self.type = xml.get('type')
-        self.features = dict()
-        self.limits = dict()
+        self.registry = registry
         self.platform = xml.get('platform')
         self.provisional = xml.get('provisional')
         self.promotedTo = xml.get('promotedto')
@@ -1429,47 +1994,257 @@ class VulkanExtension(VulkanDefinitionScope):
         self.parseAliases(xml)
 
 
+class VulkanXmlBackend():
+    # XML parsers able to load the registry, lxml's C parser is preferred when it is installed
+    names = [ 'auto', 'lxml', 'etree' ]
+
+    def __init__(self, name = 'auto'):
+        if name == 'auto':
+            name = 'lxml' if lxmletree != None else 'etree'
+        if name == 'lxml' and lxmletree is None:
+            Log.f("The lxml XML backend was requested, but the lxml module is not installed")
+        if not name in self.names:
+            Log.f("Unknown XML backend: '{0}'".format(name))
+        self.name = name
+
+
+    def parse(self, file):
+        if self.name == 'lxml':
+            # Comments are dropped to match the element trees built by the standard library parser
+            return lxmletree.parse(file, parser = lxmletree.XMLParser(remove_comments = True))
+        else:
+            return etree.parse(file)
+
+
+    def iterparse(self, file, events):
+        if self.name == 'lxml':
+            return lxmletree.iterparse(file, events = events, remove_comments = True)
+        else:
+            return etree.iterparse(file, events = events)
+
+
+class VulkanRegistryElements():
+    # Top-level registry elements whose children are collected one by one
+    containerTags = [ 'types', 'extensions', 'commands' ]
+
+    # Type categories needed to build the registry
+    typeCategories = [ 'struct', 'enum', 'bitmask', 'include', 'define' ]
+
+    def __init__(self):
+        self.platforms = []
+        self.features = []
+        self.featuresByName = dict()
+        self.extensions = []
+        self.extensionsByName = dict()
+        self.types = dict()
+        for category in self.typeCategories:
+            self.types[category] = []
+        self.requiresTypes = []
+        self.enums = []
+        self.enumsByName = dict()
+        self.featureEnumExtends = dict()
+        self.extensionEnumExtends = dict()
+        self.formats = []
+
+
+    def parseTree(registryFile, backend):
+        # Loads the whole registry into memory and collects the needed elements from it
+        elements = VulkanRegistryElements()
+        root = backend.parse(registryFile).getroot()
+        for child in root:
+            if child.tag in elements.containerTags:
+                if apiNameMatch('vulkan', child.get('api')):
+                    for grandChild in child:
+                        elements.collect(grandChild)
+            else:
+                elements.collect(child)
+        return elements
+
+
+    def parseStream(registryFile, backend):
+        # Collects the needed elements in a single iterparse pass, and drops every top-level element
+        # (and every child of the container elements) as soon as it was consumed, so only the
+        # elements needed to build the registry are ever retained
+        elements = VulkanRegistryElements()
+        stack = []
+        for event, elem in backend.iterparse(registryFile, events = ('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if len(stack) == 1:
+                if not elem.tag in elements.containerTags:
+                    elements.collect(elem)
+                stack[0].remove(elem)
+            elif len(stack) == 2 and stack[1].tag in elements.containerTags:
+                if apiNameMatch('vulkan', stack[1].get('api')):
+                    elements.collect(elem)
+                stack[1].remove(elem)
+        return elements
+
+
+    def collect(self, elem):
+        if not apiNameMatch('vulkan', elem.get('api')):
+            return
+        stripNonmatchingAPIs(elem, 'vulkan', actuallyDelete = True)
+
+        if elem.tag == 'platforms':
+            self.platforms.extend(elem.findall("./platform"))
+        elif elem.tag == 'feature':
+            if elem.get('api') == 'vulkan':
+                self.features.append(elem)
+                self.featuresByName.setdefault(elem.get('name'), elem)
+                self.collectEnumExtends(elem, self.featureEnumExtends)
+        elif elem.tag == 'extension':
+            if elem.get('supported') == 'vulkan':
+                self.extensions.append(elem)
+                self.extensionsByName.setdefault(elem.get('name'), elem)
+                self.collectEnumExtends(elem, self.extensionEnumExtends)
+        elif elem.tag == 'type':
+            if elem.get('category') in self.types:
+                self.types[elem.get('category')].append(elem)
+            if elem.get('requires') != None:
+                self.requiresTypes.append(elem)
+        elif elem.tag == 'enums':
+            self.enums.append(elem)
+            self.enumsByName.setdefault(elem.get('name'), elem)
+        elif elem.tag == 'formats':
+            self.formats.extend(elem.findall("./format"))
+
+
+    def collectEnumExtends(self, elem, enumExtends):
+        for value in elem.findall("./require/enum[@extends]"):
+            enumExtends.setdefault(value.get('extends'), []).append(value)
+
+
 class VulkanRegistry():
-    def __init__(self, registryFile):
+    # Registry sections in dependency order: the sections each one depends on, the steps parsing
+    # it from the registry elements, the steps finalizing it, and the registry attributes it sets.
+    # The 'features' section fills the features and limits of the versions and extensions, and is
+    # loaded on first access to those
+    sections = OrderedDict([
+        ('platforms', ([], [ 'parsePlatformInfo' ], [], [ 'platforms' ])),
+        ('versions', ([], [ 'parseVersionInfo' ], [], [ 'versions' ])),
+        ('extensions', ([], [ 'parseExtensionInfo' ], [], [ 'extensions' ])),
+        ('headerVersion', ([ 'versions' ], [ 'parseHeaderVersion' ], [], [ 'headerVersionNumber' ])),
+        ('structs', ([ 'versions', 'extensions', 'headerVersion' ],
+            [ 'parseStructInfo', 'parsePrerequisites', 'parseStructAliases' ],
+            [ 'applyWorkarounds', 'compactStructs', 'buildStructIndexes' ],
+            [ 'structs', 'structsByExtends', 'structsBySType', 'structsByVersion', 'structsByExtension', 'nonAliasStructNames' ])),
+        ('enums', ([], [ 'parseEnums', 'parseEnumAliases' ], [ 'compactEnums' ], [ 'enums' ])),
+        ('formats', ([], [ 'parseFormats' ], [], [ 'formatCompression', 'aliasFormats', 'betaFormatFeatures' ])),
+        ('bitmasks', ([ 'enums' ], [ 'parseBitmasks', 'parseBitmaskAliases' ], [], [ 'bitmasks' ])),
+        ('constants', ([], [ 'parseConstants', 'parseConstantAliases' ], [], [ 'constants' ])),
+        ('externalTypes', ([], [ 'parseExternalTypes' ], [], [ 'includes', 'externalTypes' ])),
+        ('promotions', ([ 'versions', 'extensions' ], [], [ 'buildPromotionIndex' ], [ 'extensionPromotedToVersion' ])),
+        ('features', ([ 'versions', 'extensions', 'structs' ], [ 'parseFeatures', 'parseLimits' ], [], []))
+    ])
+
+    sectionByAttribute = { attribute: name for name, section in sections.items() for attribute in section[3] }
+
+    def __init__(self, registryFile, streaming = True, profile = False, backend = 'auto', lazy = False):
+        backend = VulkanXmlBackend(backend)
         Log.i("Loading registry file: '{0}'".format(registryFile))
-        xml = etree.parse(registryFile)
-        stripNonmatchingAPIs(xml.getroot(), 'vulkan', actuallyDelete = True)
-
-        self.parsePlatformInfo(xml)
-        self.parseVersionInfo(xml)
-        self.parseExtensionInfo(xml)
-        self.parseStructInfo(xml)
-        self.parsePrerequisites(xml)
-        self.parseEnums(xml)
-        self.parseFormats(xml)
-        self.parseBitmasks(xml)
-        self.parseConstants(xml)
-        self.parseAliases(xml)
-        self.parseExternalTypes(xml)
-        self.parseFeatures(xml)
-        self.parseLimits(xml)
-        self.parseHeaderVersion(xml)
-        self.applyWorkarounds()
+        timings = []
+        start = time.perf_counter()
+        if streaming:
+            xml = VulkanRegistryElements.parseStream(registryFile, backend)
+        else:
+            xml = VulkanRegistryElements.parseTree(registryFile, backend)
+        timings.append(('parseStream' if streaming else 'parseTree', time.perf_counter() - start))
+
+        # The collected registry elements are kept until all sections are loaded
+        self.xml = xml
+        self.pendingSections = list(self.sections.keys())
+        self.profile = profile
+        if lazy:
+            if profile:
+                VulkanRegistry.logTimings('Registry element collection time', timings)
+        else:
+            self.loadAllSections(timings)
+            if profile:
+                VulkanRegistry.logTimings('Registry load time', timings)
+
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, which includes those of unloaded sections
+        if name in self.sectionByAttribute and 'pendingSections' in self.__dict__:
+            self.loadSection(self.sectionByAttribute[name])
+            return object.__getattribute__(self, name)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+
+    def __getstate__(self):
+        # The collected registry elements cannot be serialized, so serialize a fully loaded registry
+        self.loadAllSections()
+        return self.__dict__
+
+
+    def loadSection(self, section, timings = None):
+        if not 'pendingSections' in self.__dict__ or not section in self.pendingSections:
+            return
+        dependencies, parseSteps, finalizeSteps, attributes = self.sections[section]
+        for dependency in dependencies:
+            self.loadSection(dependency, timings)
+
+        sectionTimings = []
+        self.pendingSections.remove(section)
+        for step in parseSteps:
+            start = time.perf_counter()
+            getattr(self, step)(self.xml)
+            sectionTimings.append((step, time.perf_counter() - start))
+        for step in finalizeSteps:
+            start = time.perf_counter()
+            getattr(self, step)()
+            sectionTimings.append((step, time.perf_counter() - start))
+
+        if timings != None:
+            timings.extend(sectionTimings)
+        elif self.profile:
+            VulkanRegistry.logTimings("Registry section '{0}' load time".format(section), sectionTimings)
+
+        if len(self.pendingSections) == 0:
+            del self.xml
+            del self.pendingSections
+            del self.profile
+
+
+    def loadSections(self, sections):
+        for section in sections:
+            self.loadSection(section)
+
+
+    def loadAllSections(self, timings = None):
+        for section in self.sections:
+            self.loadSection(section, timings)
+
+
+    def logTimings(title, timings):
+        total = sum([ timing[1] for timing in timings ])
+        Log.i("{0}: {1:.1f} ms".format(title, total * 1000))
+        for name, duration in timings:
+            Log.i("  {0}: {1:.1f} ms ({2:.1f}%)".format(name, duration * 1000, 100 * duration / total if total > 0 else 0))
 
 
     def parsePlatformInfo(self, xml):
         self.platforms = dict()
-        for plat in xml.findall("./platforms/platform"):
+        for plat in xml.platforms:
             self.platforms[plat.get('name')] = VulkanPlatform(plat)
 
 
     def parseVersionInfo(self, xml):
         self.versions = dict()
-        for feature in xml.findall("./feature[@api='vulkan']"):
+        for feature in xml.features:
             if re.search(r"^[1-9][0-9]*\.[0-9]+$", feature.get('number')):
-                self.versions[feature.get('name')] = VulkanVersion(feature)
+                self.versions[feature.get('name')] = VulkanVersion(feature, self)
             else:
                 Log.f("Unsupported feature with number '{0}'".format(feature.get('number')))
 
 
     def parseExtensionInfo(self, xml):
         self.extensions = dict()
-        for ext in xml.findall("./extensions/extension[@supported='vulkan']"):
+        for ext in xml.extensions:
             name = ext.get('name')
 
             # Find name enum (due to inconsistencies in lower case and upper case names this is non-trivial)
@@ -1478,7 +2253,7 @@ class VulkanRegistry():
             for match in matches:
                 if match.get('name').endswith("_EXTENSION_NAME"):
                     # Add extension definition
-                    self.extensions[name] = VulkanExtension(ext, match.get('name')[:-len("_EXTENSION_NAME")])
+                    self.extensions[name] = VulkanExtension(ext, match.get('name')[:-len("_EXTENSION_NAME")], self)
                     foundNameEnum = True
                     break
             if not foundNameEnum:
@@ -1487,7 +2262,7 @@ class VulkanRegistry():
 
     def parseStructInfo(self, xml):
         self.structs = dict()
-        for struct in xml.findall("./types/type[@category='struct']"):
+        for struct in xml.types['struct']:
             # Define base struct information
             structDef = VulkanStruct(struct.get('name'))
 
@@ -1557,14 +2332,15 @@ class VulkanRegistry():
 
     def parsePrerequisites(self, xml):
         # Check features (i.e. API versions)
-        for feature in xml.findall("./feature[@api='vulkan']"):
+        for feature in xml.features:
+            number = VulkanVersionNumber(feature.get('number'))
             for requireType in feature.findall('./require/type'):
                 # Add feature as the source of the definition of a struct
                 if requireType.get('name') in self.structs:
-                    self.structs[requireType.get('name')].definedByVersion = VulkanVersionNumber(feature.get('number'))
+                    self.structs[requireType.get('name')].definedByVersion = number
 
         # Check extensions
-        for extension in xml.findall("./extensions/extension[@supported='vulkan']"):
+        for extension in xml.extensions:
             for requireType in extension.findall('./require/type'):
                 # Add extension as the source of the definition of a struct
                 if requireType.get('name') in self.structs:
@@ -1574,22 +2350,22 @@ class VulkanRegistry():
     def parseEnums(self, xml):
         self.enums = dict()
         # Find enum definitions
-        for enum in xml.findall("./types/type[@category='enum']"):
+        for enum in xml.types['enum']:
             # Create enum type
             enumDef = VulkanEnum(enum.get('name'))
 
             # First collect base values
-            values = xml.find("./enums[@name='" + enumDef.name + "']")
-            if values:
+            values = xml.enumsByName.get(enumDef.name)
+            if values != None:
                 for value in values.findall("./enum"):
                     if value.get('alias') is None:
                         enumDef.values.append(value.get('name'))
 
             # Then find extension values
-            for value in xml.findall(".//feature[@api='vulkan']/require/enum[@extends='" + enumDef.name + "']"):
+            for value in xml.featureEnumExtends.get(enumDef.name, []):
                 if value.get('alias') is None:
                     enumDef.values.append(value.get('name'))
-            for value in xml.findall(".//extension[@supported='vulkan']/require/enum[@extends='" + enumDef.name + "']"):
+            for value in xml.extensionEnumExtends.get(enumDef.name, []):
                 if value.get('alias') is None:
                     enumDef.values.append(value.get('name'))
 
@@ -1599,22 +2375,24 @@ class VulkanRegistry():
 
     def parseFormats(self, xml):
         self.formatCompression = dict()
-        for enum in xml.findall("./formats/format"):
+        for enum in xml.formats:
             if enum.get('compressed'):
                 self.formatCompression[enum.get('name')] = enum.get('compressed')
 
         self.aliasFormats = list()
-        for format in xml.findall("./extensions/extension[@supported='vulkan']/require/enum[@extends='VkFormat'][@alias]"):
-            self.aliasFormats.append(format.attrib["name"])
+        for format in xml.extensionEnumExtends.get('VkFormat', []):
+            if format.get('alias') != None:
+                self.aliasFormats.append(format.attrib["name"])
 
         self.betaFormatFeatures = list()
-        for format_feature in xml.findall("./extensions/extension[@supported='vulkan']/require/enum[@protect='VK_ENABLE_BETA_EXTENSIONS']"):
-            self.betaFormatFeatures.append(format_feature.attrib["name"])
+        for extension in xml.extensions:
+            for format_feature in extension.findall("./require/enum[@protect='VK_ENABLE_BETA_EXTENSIONS']"):
+                self.betaFormatFeatures.append(format_feature.attrib["name"])
 
     def parseBitmasks(self, xml):
         self.bitmasks = dict()
         # Find bitmask definitions
-        for bitmask in xml.findall("./types/type[@category='bitmask']"):
+        for bitmask in xml.types['bitmask']:
             # Only consider non-alias bitmasks
             name = bitmask.find("./name")
             if bitmask.get('alias') is None and name != None:
@@ -1642,7 +2420,7 @@ class VulkanRegistry():
     def parseConstants(self, xml):
         self.constants = dict()
         # Find constant definitions
-        constants = xml.find("./enums[@name='API Constants']").findall("./enum[@value]")
+        constants = xml.enumsByName['API Constants'].findall("./enum[@value]")
         if constants != None:
             for constant in constants:
                 self.constants[constant.get('name')] = constant.get('value')
@@ -1650,9 +2428,9 @@ class VulkanRegistry():
             Log.f("Failed to find API constants in the registry")
 
 
-    def parseAliases(self, xml):
+    def parseStructAliases(self, xml):
         # Find any struct aliases
-        for struct in xml.findall("./types/type[@category='struct']"):
+        for struct in xml.types['struct']:
             alias = struct.get('alias')
             if alias != None:
                 if alias in self.structs:
@@ -1698,8 +2476,10 @@ class VulkanRegistry():
                 else:
                     Log.f("Failed to find alias '{0}' of struct '{1}'".format(alias, struct.get('name')))
 
+
+    def parseEnumAliases(self, xml):
         # Find any enum aliases
-        for enum in xml.findall("./types/type[@category='enum']"):
+        for enum in xml.types['enum']:
             alias = enum.get('alias')
             if alias != None:
                 if alias in self.enums:
@@ -1722,7 +2502,7 @@ class VulkanRegistry():
                     Log.f("Failed to find alias '{0}' of enum '{1}'".format(alias, enum.get('name')))
 
         # Find any enum value aliases
-        for enum in xml.findall("./enums"):
+        for enum in xml.enums:
             if enum.get('name') in self.enums.keys():
                 enumDef = self.enums[enum.get('name')]
                 for aliasValue in enum.findall("./enum[@alias]"):
@@ -1730,16 +2510,19 @@ class VulkanRegistry():
                     alias = aliasValue.get('alias')
                     enumDef.values.append(name)
                     enumDef.aliasValues[name] = alias
-        for aliasValue in xml.findall("./extensions/extension[@supported='vulkan']/require/enum[@alias]"):
-            if aliasValue.get('extends'):
-                enumDef = self.enums[aliasValue.get('extends')]
-                name = aliasValue.get('name')
-                alias = aliasValue.get('alias')
-                enumDef.values.append(name)
-                enumDef.aliasValues[name] = alias
+        for extension in xml.extensions:
+            for aliasValue in extension.findall("./require/enum[@alias]"):
+                if aliasValue.get('extends'):
+                    enumDef = self.enums[aliasValue.get('extends')]
+                    name = aliasValue.get('name')
+                    alias = aliasValue.get('alias')
+                    enumDef.values.append(name)
+                    enumDef.aliasValues[name] = alias
+
 
+    def parseBitmaskAliases(self, xml):
         # Find any bitmask (flags) aliases
-        for bitmask in xml.findall("./types/type[@category='bitmask']"):
+        for bitmask in xml.types['bitmask']:
             name = bitmask.get('name')
             alias = bitmask.get('alias')
             if alias != None:
@@ -1758,8 +2541,10 @@ class VulkanRegistry():
                 else:
                     Log.f("Failed to find alias '{0}' of bitmask '{1}'".format(alias, bitmask.get('name')))
 
+
+    def parseConstantAliases(self, xml):
         # Find any constant aliases
-        for constant in xml.find("./enums[@name='API Constants']").findall("./enum[@alias]"):
+        for constant in xml.enumsByName['API Constants'].findall("./enum[@alias]"):
             self.constants[constant.get('name')] = self.constants[constant.get('alias')]
 
 
@@ -1768,16 +2553,21 @@ class VulkanRegistry():
         self.externalTypes = set()
 
         # Find all include definitions
-        for include in xml.findall("./types/type[@category='include']"):
+        for include in xml.types['include']:
             self.includes.add(include.get('name'))
 
         # Find all types depending on the includes
-        for type in xml.findall("./types/type[@requires]"):
+        for type in xml.requiresTypes:
             if type.get('requires') in self.includes:
                 self.externalTypes.add(type.get('name'))
 
 
     def parseFeatures(self, xml):
+        for scope in list(self.versions.values()) + list(self.extensions.values()):
+            scope.features = dict()
+            scope.limits = dict()
+            scope.registry = None
+
         # First, parse features specific to Vulkan versions
         for version in self.versions.values():
             if version.name == 'VK_VERSION_1_0':
@@ -1789,7 +2579,7 @@ class VulkanRegistry():
             else:
                 # For all other versions use the feature structures required by it
                 featureStructNames = []
-                xmlVersion = xml.find("./feature[@api='vulkan'][@name='" + version.name + "']")
+                xmlVersion = xml.featuresByName[version.name]
                 for type in xmlVersion.findall("./require/type"):
                     name = type.get('name')
                     if name in self.structs and 'VkPhysicalDeviceFeatures2' in self.structs[name].extends:
@@ -1809,10 +2599,16 @@ class VulkanRegistry():
                                 version.features[memberName] = VulkanFeature(memberName)
                             version.features[memberName].structs.update(structDef.aliases)
 
+        # Map each feature name to the corresponding features of all versions
+        versionFeatures = dict()
+        for version in self.versions.values():
+            for memberName, feature in version.features.items():
+                versionFeatures.setdefault(memberName, []).append(feature)
+
         # Then parse features specific to extensions
         for extension in self.extensions.values():
             featureStructNames = []
-            xmlExtension = xml.find("./extensions/extension[@supported='vulkan'][@name='" + extension.name + "']")
+            xmlExtension = xml.extensionsByName[extension.name]
             for type in xmlExtension.findall("./require/type"):
                 name = type.get('name')
                 if name in self.structs and 'VkPhysicalDeviceFeatures2' in self.structs[name].extends:
@@ -1826,9 +2622,9 @@ class VulkanRegistry():
                     # For each feature we also have to check whether it's part of core so that
                     # any not strictly alias struct (i.e. the VkPhysicalDeviceVulkanXXFeatures)
                     # get included as well
-                    for version in self.versions.values():
-                        if memberName in version.features and version.features[memberName].structs >= extension.features[memberName].structs:
-                            extension.features[memberName].structs = version.features[memberName].structs
+                    for versionFeature in versionFeatures.get(memberName, []):
+                        if versionFeature.structs >= extension.features[memberName].structs:
+                            extension.features[memberName].structs = versionFeature.structs
 
 
     def parseLimits(self, xml):
@@ -1845,7 +2641,7 @@ class VulkanRegistry():
             else:
                 # For all other versions use the property structures required by it
                 limitStructNames = []
-                xmlVersion = xml.find("./feature[@api='vulkan'][@name='" + version.name + "']")
+                xmlVersion = xml.featuresByName[version.name]
                 for type in xmlVersion.findall("./require/type"):
                     name = type.get('name')
                     if name in self.structs and 'VkPhysicalDeviceProperties2' in self.structs[name].extends:
@@ -1865,10 +2661,16 @@ class VulkanRegistry():
                             version.limits[memberName] = VulkanLimit(memberName)
                         version.limits[memberName].structs.update(structDef.aliases)
 
+        # Map each limit name to the corresponding limits of all versions
+        versionLimits = dict()
+        for version in self.versions.values():
+            for memberName, limit in version.limits.items():
+                versionLimits.setdefault(memberName, []).append(limit)
+
         # Then parse properties/limits specific to extensions
         for extension in self.extensions.values():
             limitStructNames = []
-            xmlExtension = xml.find("./extensions/extension[@supported='vulkan'][@name='" + extension.name + "']")
+            xmlExtension = xml.extensionsByName[extension.name]
             for type in xmlExtension.findall("./require/type"):
                 name = type.get('name')
                 if name in self.structs and 'VkPhysicalDeviceProperties2' in self.structs[name].extends:
@@ -1882,9 +2684,9 @@ class VulkanRegistry():
                     # For each limit we also have to check whether it's part of core so that
                     # any not strictly alias struct (i.e. the VkPhysicalDeviceVulkanXXProperties)
                     # get included as well
-                    for version in self.versions.values():
-                        if memberName in version.limits and version.limits[memberName].structs >= extension.limits[memberName].structs:
-                            extension.limits[memberName].structs = version.limits[memberName].structs
+                    for versionLimit in versionLimits.get(memberName, []):
+                        if versionLimit.structs >= extension.limits[memberName].structs:
+                            extension.limits[memberName].structs = versionLimit.structs
 
 
     def parseHeaderVersion(self, xml):
@@ -1892,7 +2694,7 @@ class VulkanRegistry():
         maxVersionNumber = self.versions[max(self.versions, key = lambda version: self.versions[version].number)].number
         self.headerVersionNumber = VulkanVersionNumber(str(maxVersionNumber))
         # Add patch from VK_HEADER_VERSION define
-        for define in xml.findall("./types/type[@category='define']"):
+        for define in xml.types['define']:
             name = define.find('./name')
             if name != None and name.text == 'VK_HEADER_VERSION':
                 self.headerVersionNumber.patch = int(name.tail.lstrip())
@@ -2136,18 +2938,153 @@ class VulkanRegistry():
         self.structs.pop('VkVideoProfilesKHR', None)
 
 
+    def compactLists(objects, attributes):
+        # Parsing is complete, so store the lists that are no longer modified as tuples, while
+        # keeping the lists shared between aliases shared
+        tuples = dict()
+        for obj in objects:
+            for attribute in attributes:
+                values = getattr(obj, attribute)
+                if not id(values) in tuples:
+                    tuples[id(values)] = (values, tuple(values))
+                setattr(obj, attribute, tuples[id(values)][1])
+
+
+    def compactStructs(self):
+        VulkanRegistry.compactLists(self.structs.values(), [ 'extends', 'definedByExtensions' ])
+
+
+    def compactEnums(self):
+        VulkanRegistry.compactLists(self.enums.values(), [ 'values' ])
+
+
+    def getMemoryReport(self):
+        # Estimates the footprint of the registry data model, and compares it to what the same
+        # objects would take with per-instance dictionaries, lists instead of tuples, and without
+        # interned strings
+        self.loadAllSections()
+        class DictBacked():
+            pass
+
+        objects = dict()
+        def visit(obj):
+            if obj != None and not id(obj) in objects:
+                objects[id(obj)] = obj
+
+        for platform in self.platforms.values():
+            visit(platform)
+        for structDef in self.structs.values():
+            visit(structDef)
+            visit(structDef.definedByVersion)
+            for member in structDef.members.values():
+                visit(member)
+        for enumDef in self.enums.values():
+            visit(enumDef)
+        for bitmaskDef in self.bitmasks.values():
+            visit(bitmaskDef)
+        for scope in list(self.versions.values()) + list(self.extensions.values()):
+            visit(scope)
+            for feature in scope.features.values():
+                visit(feature)
+            for limit in scope.limits.values():
+                visit(limit)
+
+        classStats = dict()
+        tupleIds = set()
+        compactTuples = 0
+        listTuples = 0
+        for obj in objects.values():
+            attributes = dict()
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', []):
+                    attributes[slot] = getattr(obj, slot)
+                    if isinstance(attributes[slot], tuple) and not id(attributes[slot]) in tupleIds:
+                        tupleIds.add(id(attributes[slot]))
+                        compactTuples += sys.getsizeof(attributes[slot])
+                        listTuples += sys.getsizeof(list(attributes[slot]))
+
+            stats = classStats.setdefault(type(obj).__name__, [ 0, 0, 0 ])
+            stats[0] += 1
+            stats[1] += sys.getsizeof(obj)
+            stats[2] += sys.getsizeof(DictBacked()) + sys.getsizeof(attributes)
+
+        strings = dict()
+        stringRefs = 0
+        stringRefBytes = 0
+        for obj in objects.values():
+            if isinstance(obj, VulkanStructMember):
+                for value in [ obj.name, obj.type, obj.limittype ]:
+                    if value != None:
+                        strings[id(value)] = value
+                        stringRefs += 1
+                        stringRefBytes += sys.getsizeof(value)
+        internedBytes = sum([ sys.getsizeof(value) for value in strings.values() ])
+
+        compactTotal = compactTuples + internedBytes
+        dictTotal = listTuples + stringRefBytes
+        lines = [ 'Registry memory report (estimated sizes in bytes, compact / dict-based):' ]
+        for name in sorted(classStats):
+            stats = classStats[name]
+            lines.append('  {0}: {1} objects, {2} / {3}'.format(name, stats[0], stats[1], stats[2]))
+            compactTotal += stats[1]
+            dictTotal += stats[2]
+        lines.append('  Tuples: {0} objects, {1} / {2}'.format(len(tupleIds), compactTuples, listTuples))
+        lines.append('  Member name and type strings: {0} references, {1} unique, {2} / {3}'.format(
+            stringRefs, len(strings), internedBytes, stringRefBytes))
+        lines.append('  Total: {0} / {1} ({2:.1f}% saved)'.format(
+            compactTotal, dictTotal, 100.0 * (dictTotal - compactTotal) / dictTotal if dictTotal > 0 else 0.0))
+        return '\n'.join(lines)
+
+
+    def buildStructIndexes(self):
+        # Reverse lookup tables, so that generators don't have to scan all structures repeatedly;
+        # lists of structure names follow the order of self.structs
+        self.structsByExtends = dict()
+        self.structsBySType = dict()
+        self.structsByVersion = dict()
+        self.structsByExtension = dict()
+        self.nonAliasStructNames = dict()
+        for name, structDef in self.structs.items():
+            for extends in structDef.extends:
+                self.structsByExtends.setdefault(extends, []).append(name)
+            if structDef.sType != None:
+                self.structsBySType.setdefault(structDef.sType, name)
+            if structDef.definedByVersion != None:
+                self.structsByVersion.setdefault(structDef.definedByVersion.define, []).append(name)
+            for extName in structDef.definedByExtensions:
+                self.structsByExtension.setdefault(extName, []).append(name)
+            if structDef.isAlias:
+                self.nonAliasStructNames[name] = None
+                for alias in structDef.aliases:
+                    if not self.structs[alias].isAlias:
+                        self.nonAliasStructNames[name] = alias
+                        break
+            else:
+                self.nonAliasStructNames[name] = name
+
+
+    def buildPromotionIndex(self):
+        # Reverse lookup table, so that generators don't have to walk the promotion chains repeatedly
+        self.extensionPromotedToVersion = dict()
+        for extName, extension in self.extensions.items():
+            promotedTo = extension.promotedTo
+            version = None
+            while promotedTo != None:
+                if promotedTo in self.extensions:
+                    # Functionality was promoted to another extension, continue with that
+                    promotedTo = self.extensions[promotedTo].promotedTo
+                elif promotedTo in self.versions:
+                    # Found extension in a core API version, we're done
+                    version = self.versions[promotedTo]
+                    break
+                else:
+                    # Promoted to something that is not part of the Vulkan API
+                    break
+            self.extensionPromotedToVersion[extName] = version
+
+
     def getExtensionPromotedToVersion(self, extensionName):
-        promotedTo = self.extensions[extensionName].promotedTo
-        version = None
-        while promotedTo != None:
-            if promotedTo in self.extensions:
-                # Functionality was promoted to another extension, continue with that
-                promotedTo = self.extensions[promotedTo].promotedTo
-            elif promotedTo in self.versions:
-                # Found extension in a core API version, we're done
-                version = self.versions[promotedTo]
-                break
-        return version
+        return self.extensionPromotedToVersion[extensionName]
 
 
     def getChainableStructDef(self, name, extends):
@@ -2156,7 +3093,7 @@ class VulkanRegistry():
             Log.f("Structure '{0}' does not exist".format(name))
         if structDef.sType == None:
             Log.f("Structure '{0}' is not chainable".format(name))
-        if not extends in structDef.extends + [ name ]:
+        if not extends in structDef.extends and extends != name:
             Log.f("Structure '{0}' does not extend '{1}'".format(name, extends))
         return structDef
 
@@ -2171,6 +3108,8 @@ class VulkanRegistry():
             return arraySize
 
     def getNonAliasTypeName(self, alias, types):
+        if types is self.structs:
+            return self.nonAliasStructNames[alias]
         typeDef = types[alias]
         if typeDef.isAlias:
             for alias in typeDef.aliases:
@@ -2180,31 +3119,326 @@ class VulkanRegistry():
             return alias
 
 
+class VulkanRegistryUnpickler(pickle.Unpickler):
+    # Registry snapshots may have been written when this script was run as __main__ or when it
+    # was imported by one of the other generator scripts, so map both to this module, and only
+    # allow the classes that a registry snapshot is expected to contain
+    allowedClasses = [
+        'VulkanRegistry', 'VulkanPlatform', 'VulkanStructMember', 'VulkanStruct', 'VulkanEnum',
+        'VulkanBitmask', 'VulkanFeature', 'VulkanLimit', 'VulkanVersionNumber', 'VulkanVersion',
+        'VulkanExtension'
+    ]
+
+    def find_class(self, module, name):
+        if module in [ '__main__', 'gen_profiles_solution', __name__ ] and name in self.allowedClasses:
+            return globals()[name]
+        elif module in [ 'collections', 'typing' ] and name == 'OrderedDict':
+            return OrderedDict
+        else:
+            raise pickle.UnpicklingError("Unexpected type in registry cache: '{0}.{1}'".format(module, name))
+
+
+class VulkanRegistryCache():
+    def getKey(registryFile):
+        # The cache key covers both the registry contents and this script, as any change to the
+        # registry parsing code may change the contents of the snapshot
+        hash = hashlib.sha256()
+        for file in [ registryFile, os.path.abspath(__file__) ]:
+            with open(file, 'rb') as f:
+                hash.update(f.read())
+        return hash.hexdigest()
+
+
+    def getDefaultDir():
+        # Per-user cache directory, used by the tools that should benefit from the cache without
+        # being explicitly given a cache directory
+        cacheHome = os.environ.get('XDG_CACHE_HOME')
+        if not cacheHome:
+            cacheHome = os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(cacheHome, 'vulkan-profiles')
+
+
+    def load(registryFile, cacheDir = None, profile = False, backend = 'auto'):
+        if cacheDir is None:
+            # Without a cache, only the registry sections actually used get parsed
+            return VulkanRegistry(registryFile, profile = profile, backend = backend, lazy = True)
+
+        cacheFile = os.path.join(cacheDir, 'vk_registry_{0}.pickle'.format(VulkanRegistryCache.getKey(registryFile)))
+        if os.path.isfile(cacheFile):
+            try:
+                with open(cacheFile, 'rb') as f:
+                    registry = VulkanRegistryUnpickler(f).load()
+                Log.i("Loaded registry file '{0}' from cache: '{1}'".format(registryFile, cacheFile))
+                return registry
+            except Exception as e:
+                Log.w("Ignoring invalid registry cache file '{0}': {1}".format(cacheFile, e))
+
+        registry = VulkanRegistry(registryFile, profile = profile, backend = backend)
+        try:
+            VulkanRegistryCache.store(registry, cacheFile)
+        except OSError as e:
+            # The cache is only an optimization, so an unwritable cache directory must not fail the generation
+            Log.w("Failed to store registry cache file '{0}': {1}".format(cacheFile, e))
+        return registry
+
+
+    def store(registry, cacheFile):
+        # Write to a temporary file first so that concurrent generator invocations never see a
+        # partially written snapshot
+        cacheDir = os.path.dirname(cacheFile)
+        os.makedirs(cacheDir, exist_ok = True)
+        registry.loadAllSections()
+        fd, tmpFile = tempfile.mkstemp(dir = cacheDir, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(registry, f, protocol = pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpFile, cacheFile)
+        except:
+            os.remove(tmpFile)
+            raise
+        Log.i("Stored registry cache file: '{0}'".format(cacheFile))
+
+
+class VulkanRegistrySet():
+    def __init__(self, registryFiles, cacheDir = None):
+        # Registries are ordered by header version, so the first registry defining something is
+        # the oldest header defining it; all sections are loaded so that the registry elements
+        # are released before definitions get shared
+        self.registries = [ VulkanRegistryCache.load(registryFile, cacheDir) for registryFile in registryFiles ]
+        for registry in self.registries:
+            registry.loadAllSections()
+        self.registries.sort(key = lambda registry: VulkanRegistrySet.getVersionKey(registry.headerVersionNumber))
+
+        self.structFirstDefinedIn = dict()
+        self.memberFirstDefinedIn = dict()
+        self.shareDefinitions()
+
+
+    def getVersionKey(version):
+        return (version.major, version.minor, version.patch if version.patch != None else 0)
+
+
+    def getMemberKey(member):
+        arraySize = tuple(member.arraySize) if isinstance(member.arraySize, list) else member.arraySize
+        return (member.name, member.type, member.limittype, member.isArray, member.arraySizeMember, member.nullTerminated, arraySize)
+
+
+    def shareDefinitions(self):
+        # Identical struct and member definitions are shared between the registries, hence the
+        # registries of the set must be treated as read-only. Structs only differing from an
+        # already shared one in some of their members are replaced by a copy using the shared
+        # member definitions, so the definitions of the loaded registries are never modified
+        sharedMembers = dict()
+        sharedMemberDicts = dict()
+        sharedStructs = dict()
+        structCount = 0
+        for registry in self.registries:
+            for name in list(registry.structs.keys()):
+                structDef = registry.structs[name]
+                structCount += 1
+
+                memberKeys = tuple([ VulkanRegistrySet.getMemberKey(member) for member in structDef.members.values() ])
+                members = sharedMemberDicts.get(memberKeys)
+                if members is None:
+                    members = OrderedDict()
+                    for memberKey, (memberName, member) in zip(memberKeys, structDef.members.items()):
+                        members[memberName] = sharedMembers.setdefault(memberKey, member)
+                    if all([ members[memberName] is member for memberName, member in structDef.members.items() ]):
+                        members = structDef.members
+                    sharedMemberDicts[memberKeys] = members
+                for memberName in structDef.members:
+                    self.memberFirstDefinedIn.setdefault((name, memberName), registry)
+
+                structKey = (
+                    structDef.name, structDef.sType, tuple(structDef.extends), memberKeys, tuple(structDef.aliases),
+                    structDef.isAlias, str(structDef.definedByVersion), tuple(structDef.definedByExtensions)
+                )
+                sharedStruct = sharedStructs.get(structKey)
+                if sharedStruct is None:
+                    sharedStruct = structDef
+                    if not members is structDef.members:
+                        sharedStruct = VulkanStruct.__new__(VulkanStruct)
+                        for slot in VulkanStruct.__slots__:
+                            setattr(sharedStruct, slot, getattr(structDef, slot))
+                        sharedStruct.members = members
+                    sharedStructs[structKey] = sharedStruct
+                registry.structs[name] = sharedStruct
+                self.structFirstDefinedIn.setdefault(name, registry)
+
+        Log.i("Loaded {0} registries with {1} unique out of {2} struct definitions and {3} unique member definitions".format(
+            len(self.registries), len(sharedStructs), structCount, len(sharedMembers)))
+
+
+    def getStructFirstHeaderVersion(self, structName):
+        registry = self.structFirstDefinedIn.get(structName)
+        return registry.headerVersionNumber if registry != None else None
+
+
+    def getMemberFirstHeaderVersion(self, structName, memberName):
+        registry = self.memberFirstDefinedIn.get((structName, memberName))
+        return registry.headerVersionNumber if registry != None else None
+
+
+    def getProfileHeaderVersion(self, profile):
+        # Returns the oldest header version of the set defining all structures and members the
+        # profile requires, or None if some of them are not defined by any of the headers
+        required = []
+        for caps in profile.capabilities.getAllCapabilities():
+            for structs in [ caps.features, caps.properties ] + caps.queueFamiliesProperties + list(caps.formats.values()):
+                for structName, members in structs.items():
+                    required.append((structName, None))
+                    required.extend([ (structName, memberName) for memberName in members ])
+
+        headerVersion = None
+        for structName, memberName in required:
+            if memberName is None:
+                version = self.getStructFirstHeaderVersion(structName)
+            else:
+                version = self.getMemberFirstHeaderVersion(structName, memberName)
+            if version is None:
+                Log.w("'{0}' required by profile '{1}' is not defined by any of the registries".format(
+                    structName if memberName is None else structName + '.' + memberName, profile.name))
+                return None
+            if headerVersion is None or VulkanRegistrySet.getVersionKey(version) > VulkanRegistrySet.getVersionKey(headerVersion):
+                headerVersion = version
+        return headerVersion
+
+
 class VulkanProfileCapabilities():
-    def __init__(self, registry, data, caps):
-        self.extensions = dict()
-        self.instanceExtensions = dict()
-        self.deviceExtensions = dict()
-        self.features = dict()
-        self.properties = dict()
-        self.formats = dict()
-        self.queueFamiliesProperties = []
+    # Each capability section of a profile is merged from the capability blocks defining it, and
+    # identified by the content hashes of these blocks, so merging the same blocks again shares the
+    # merged data of the section instead, across all profiles merged with the same mergedSections
+    sections = [
+        ('extensions', [ 'extensions', 'instanceExtensions', 'deviceExtensions' ]),
+        ('features', [ 'features' ]),
+        ('properties', [ 'properties' ]),
+        ('formats', [ 'formats' ]),
+        ('queueFamiliesProperties', [ 'queueFamiliesProperties' ])
+    ]
+
+
+    def __init__(self, registry, blocks, mergedSections):
+        # Alternative capability sets are stored in groups, each being a list of capabilities
+        # only containing what the alternative requires on top of the common part of the group
+        self.alternatives = []
+        # The section keys identify the merged data of each section, so that the code generated
+        # from it can also be shared
+        self.sectionKeys = dict()
+        self.mergeBlocks(registry, blocks, mergedSections)
+
+
+    def fromProfile(registry, data, caps, mergedSections):
+        blocks = []
+        alternatives = []
         for capName in data['capabilities']:
-            # When we have multiple possible capabilities blocks, we load them all but effectively the API library can't effectively implement this behavior.
             if type(capName).__name__ == 'list':
-                for capNameCase in capName:
-                    self.mergeCaps(registry, caps[capNameElement])
-            elif capName in caps:
-                self.mergeCaps(registry, caps[capName])
+                # Multiple possible capabilities blocks: the part that is common to all alternatives
+                # is required by the profile, and only the rest is stored for each alternative
+                altBlocks = [ VulkanProfileCapabilities.getProfileBlock(data, caps, capNameCase) for capNameCase in capName ]
+                common = altBlocks[0]
+                for altBlock in altBlocks[1:]:
+                    common = VulkanProfileCapabilities.getCommonCapData(common, altBlock)
+                blocks.append(VulkanProfileCapabilities.getBlock(common))
+                alternatives.append([ VulkanProfileCapabilities.getResidualCapData(altBlock, common) for altBlock in altBlocks ])
             else:
-                Log.f("Capability '{0}' needed by profile '{1}' is missing".format(capName, data['name']))
-
-    def mergeCaps(self, registry, caps):
-        self.mergeProfileExtensions(registry, caps)
-        self.mergeProfileFeatures(caps)
-        self.mergeProfileProperties(caps)
-        self.mergeProfileFormats(caps)
-        self.mergeProfileQueueFamiliesProperties(caps)
+                blocks.append(VulkanProfileCapabilities.getBlock(VulkanProfileCapabilities.getProfileBlock(data, caps, capName)))
+        capabilities = VulkanProfileCapabilities(registry, blocks, mergedSections)
+        for altBlocks in alternatives:
+            group = []
+            for altBlock in altBlocks:
+                group.append(VulkanProfileCapabilities(registry, [ VulkanProfileCapabilities.getBlock(altBlock) ], mergedSections))
+            capabilities.alternatives.append(group)
+        return capabilities
+
+
+    def getProfileBlock(data, caps, capName):
+        if not capName in caps:
+            Log.f("Capability '{0}' needed by profile '{1}' is missing".format(capName, data['name']))
+        return caps[capName]
+
+
+    def getCommonCapData(first, second):
+        # Returns the requirements found in both capability data, or None if there are none
+        if type(first) != type(second):
+            return None
+        elif type(first) == dict:
+            common = dict()
+            for key, val in first.items():
+                if key in second:
+                    commonVal = VulkanProfileCapabilities.getCommonCapData(val, second[key])
+                    if commonVal != None:
+                        common[key] = commonVal
+            return common if common else None
+        elif type(first) == list and all([ type(val) == str for val in first + second ]):
+            common = [ val for val in first if val in second ]
+            return common if common else None
+        else:
+            return first if first == second else None
+
+
+    def getResidualCapData(data, common):
+        # Returns the requirements of the capability data not already covered by the common data
+        if common is None:
+            return data
+        elif type(data) == dict:
+            residual = dict()
+            for key, val in data.items():
+                residualVal = VulkanProfileCapabilities.getResidualCapData(val, common.get(key))
+                if residualVal != None:
+                    residual[key] = residualVal
+            return residual if residual else None
+        elif type(data) == list and all([ type(val) == str for val in data ]):
+            residual = [ val for val in data if not val in common ]
+            return residual if residual else None
+        else:
+            return None if data == common else data
+
+
+    def getAllCapabilities(self):
+        # Returns the required capabilities followed by the capabilities of all alternatives
+        allCaps = [ self ]
+        for group in self.alternatives:
+            allCaps.extend(group)
+        return allCaps
+
+
+    def getBlock(caps):
+        # Blocks are identified by their contents, including the order of their members, as that
+        # also determines the order of the merged data
+        if caps is None:
+            caps = dict()
+        key = hashlib.sha256(json.dumps(caps).encode('utf-8')).hexdigest()
+        return key, caps
+
+
+    def mergeBlocks(self, registry, blocks, mergedSections):
+        for section, attributes in VulkanProfileCapabilities.sections:
+            sectionBlocks = [ (key, caps) for key, caps in blocks if caps.get(section) != None ]
+            sectionKey = (section, tuple([ key for key, _ in sectionBlocks ]))
+            merged = mergedSections.get(sectionKey)
+            if merged is None:
+                for attribute in attributes:
+                    setattr(self, attribute, [] if section == 'queueFamiliesProperties' else dict())
+                for _, caps in sectionBlocks:
+                    self.mergeSection(registry, section, caps)
+                merged = [ getattr(self, attribute) for attribute in attributes ]
+                mergedSections[sectionKey] = merged
+            self.sectionKeys[section] = sectionKey
+            for attribute, value in zip(attributes, merged):
+                setattr(self, attribute, value)
+
+
+    def mergeSection(self, registry, section, caps):
+        if section == 'extensions':
+            self.mergeProfileExtensions(registry, caps)
+        elif section == 'features':
+            self.mergeProfileFeatures(caps)
+        elif section == 'properties':
+            self.mergeProfileProperties(caps)
+        elif section == 'formats':
+            self.mergeProfileFormats(caps)
+        else:
+            self.mergeProfileQueueFamiliesProperties(caps)
 
 
     def mergeProfileCapData(self, dst, src):
@@ -2212,19 +3446,20 @@ class VulkanProfileCapabilities():
             Log.f("Data type confict during profile capability data merge (src is '{0}', dst is '{1}')".format(type(src), type(dst)))
         elif type(src) == dict:
             for key, val in src.items():
-                if type(val) == dict:
+                if key in dst and type(dst[key]) != type(val):
+                    Log.f("Data type confict during profile capability data merge (src is '{0}', dst is '{1}')".format(type(val), type(dst[key])))
+
+                elif type(val) == dict:
                     if not key in dst:
                         dst[key] = dict()
                     self.mergeProfileCapData(dst[key], val)
 
-                elif type(val) == list:
-                    if not key in dst:
-                        dst[key] = []
-                    dst[key].extend(val)
+                elif type(val) == list and (len(val) == 0 or type(val[0]) == str):
+                    # Lists of flags and enums are merged as ordered sets, so each value is only listed once
+                    dst[key] = list(dict.fromkeys(dst[key] + val if key in dst else val))
 
                 else:
-                    if key in dst and type(dst[key]) != type(val):
-                        Log.f("Data type confict during profile capability data merge (src is '{0}', dst is '{1}')".format(type(val), type(dst[key])))
+                    # Scalars and arrays of values, where each element has its own meaning, are replaced
                     dst[key] = val
         else:
             Log.f("Unexpected data type during profile capability data merge (src is '{0}', dst is '{1}')".format(type(src), type(dst)))
@@ -2268,9 +3503,13 @@ class VulkanProfileCapabilities():
 
 class VulkanProfileStructs():
     def __init__(self, registry, caps):
+        # The structures are shared by the required capabilities and all alternatives, so that a
+        # single query of the structure chains can be used to check all of them
+        allCaps = caps.getAllCapabilities()
+
         # Feature struct types
         self.feature = []
-        for name in caps.features:
+        for name in VulkanProfileStructs.getNames([ capsEntry.features for capsEntry in allCaps ]):
             if name in [ 'VkPhysicalDeviceFeatures', 'VkPhysicalDeviceFeatures2KHR' ]:
                 # Special case, add both as VkPhysicalDeviceFeatures2KHR
                 self.feature.append(registry.structs['VkPhysicalDeviceFeatures2KHR'])
@@ -2280,7 +3519,7 @@ class VulkanProfileStructs():
 
         # Property struct types
         self.property = []
-        for name in caps.properties:
+        for name in VulkanProfileStructs.getNames([ capsEntry.properties for capsEntry in allCaps ]):
             if name in [ 'VkPhysicalDeviceProperties', 'VkPhysicalDeviceProperties2KHR' ]:
                 # Special case, add both as VkPhysicalDeviceProperties2KHR
                 self.property.append(registry.structs['VkPhysicalDeviceProperties2KHR'])
@@ -2291,8 +3530,9 @@ class VulkanProfileStructs():
         # Queue family struct types
         self.queueFamily = []
         queueFamilyStructs = dict()
-        for queueFamilyProps in caps.queueFamiliesProperties:
-            queueFamilyStructs.update(queueFamilyProps)
+        for capsEntry in allCaps:
+            for queueFamilyProps in capsEntry.queueFamiliesProperties:
+                queueFamilyStructs.update(queueFamilyProps)
         for name in queueFamilyStructs:
             if name in [ 'VkQueueFamilyProperties', 'VkQueueFamilyProperties2KHR' ]:
                 # Special case, add both as VkQueueFamilyProperties2KHR
@@ -2304,8 +3544,9 @@ class VulkanProfileStructs():
         # Format struct types
         self.format = []
         formatStructs = dict()
-        for formatProps in caps.formats.values():
-            formatStructs.update(formatProps)
+        for capsEntry in allCaps:
+            for formatProps in capsEntry.formats.values():
+                formatStructs.update(formatProps)
         for name in formatStructs:
             if name in [ 'VkFormatProperties', 'VkFormatProperties2KHR', 'VkFormatProperties3KHR' ]:
                 # Special case, add all as VkFormatProperties2KHR and VkFormatProperties3KHR
@@ -2317,6 +3558,13 @@ class VulkanProfileStructs():
         self.eliminateAliases(self.format)
 
 
+    def getNames(dataList):
+        names = dict()
+        for data in dataList:
+            names.update(data)
+        return names.keys()
+
+
     def eliminateAliases(self, structs):
         structNames = []
         duplicates = []
@@ -2330,8 +3578,21 @@ class VulkanProfileStructs():
             structs.remove(duplicate)
 
 
+    def __getstate__(self):
+        # Structure definitions belong to the registry, so only their names are serialized
+        state = dict()
+        for name, structDefs in self.__dict__.items():
+            state[name] = [ structDef.name for structDef in structDefs ]
+        return state
+
+
+    def attachRegistry(self, registry):
+        for name, structNames in self.__dict__.items():
+            setattr(self, name, [ registry.structs[structName] for structName in structNames ])
+
+
 class VulkanProfile():
-    def __init__(self, registry, name, data, caps):
+    def __init__(self, registry, name, data, caps, mergedSections = None):
         self.registry = registry
         self.name = name
         self.label = data['label']
@@ -2340,14 +3601,45 @@ class VulkanProfile():
         self.apiVersion = data['api-version']
         self.apiVersionNumber = VulkanVersionNumber(self.apiVersion)
         self.fallback = data.get('fallback')
+        # Capability sections are only shared with the profiles merged with the same mergedSections
+        self.capabilities = VulkanProfileCapabilities.fromProfile(registry, data, caps, mergedSections if mergedSections != None else dict())
+        self.privateImpls = dict()
+
+
+    # Attributes set when the structures of the profile are resolved, on first access
+    resolvedAttributes = [ 'structs', 'versionRequirements', 'extensionRequirements' ]
+
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set, which includes those of unresolved profiles
+        if name in VulkanProfile.resolvedAttributes and 'capabilities' in self.__dict__:
+            self.resolve()
+            return object.__getattribute__(self, name)
+        raise AttributeError("'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
+
+
+    def resolve(self):
+        self.structs = VulkanProfileStructs(self.registry, self.capabilities)
         self.versionRequirements = []
         self.extensionRequirements = []
-        self.capabilities = VulkanProfileCapabilities(registry, data, caps)
-        self.structs = VulkanProfileStructs(registry, self.capabilities)
         self.collectCompileTimeRequirements()
         self.validate()
 
 
+    def __getstate__(self):
+        # Profiles are serialized without the registry, which has to be reattached using
+        # attachRegistry after deserialization
+        state = self.__dict__.copy()
+        state['registry'] = None
+        return state
+
+
+    def attachRegistry(self, registry):
+        self.registry = registry
+        if 'structs' in self.__dict__:
+            self.structs.attachRegistry(registry)
+
+
     def collectCompileTimeRequirements(self):
         # Add API version to the list of requirements
         versionName = self.apiVersionNumber.define
@@ -2356,8 +3648,8 @@ class VulkanProfile():
         else:
             Log.f("No version '{0}' found in registry required by profile '{1}'".format(str(self.apiVersionNumber), self.name))
 
-        # Add any required extension to the list of requirements
-        for extName in self.capabilities.extensions:
+        # Add any required extension to the list of requirements, including those of alternatives
+        for extName in self.getExtensions():
             if extName in self.registry.extensions:
                 self.extensionRequirements.append(extName)
             else:
@@ -2368,16 +3660,24 @@ class VulkanProfile():
         self.validateStructDependencies()
 
 
+    def getExtensions(self):
+        extensions = dict()
+        for caps in self.capabilities.getAllCapabilities():
+            extensions.update(caps.extensions)
+        return extensions
+
+
     def validateStructDependencies(self):
-        for feature in self.capabilities.features:
-            self.validateStructDependency(feature)
+        for caps in self.capabilities.getAllCapabilities():
+            for feature in caps.features:
+                self.validateStructDependency(feature)
 
-        for prop in self.capabilities.properties:
-            self.validateStructDependency(prop)
+            for prop in caps.properties:
+                self.validateStructDependency(prop)
 
-        for queueFamilyData in self.capabilities.queueFamiliesProperties:
-            for queueFamilyProp in queueFamilyData:
-                self.validateStructDependency(queueFamilyProp)
+            for queueFamilyData in caps.queueFamiliesProperties:
+                for queueFamilyProp in queueFamilyData:
+                    self.validateStructDependency(queueFamilyProp)
 
 
     def validateStructDependency(self, structName):
@@ -2390,8 +3690,9 @@ class VulkanProfile():
                 depFound = True
 
             # Check if any required extension defines this struct
+            extensions = self.getExtensions()
             for definedByExtension in structDef.definedByExtensions:
-                if definedByExtension in self.capabilities.extensions:
+                if definedByExtension in extensions:
                     depFound = True
                     break
 
@@ -2401,7 +3702,15 @@ class VulkanProfile():
             Log.f("Struct '{0}' in profile '{1}' does not exist in the registry".format(structName, self.name))
 
 
-    def generatePrivateImpl(self, debugMessages):
+    def generatePrivateImpl(self, debugMessages, structFuncs = None):
+        # The generated code only depends on the profile and the registry, so it is kept with the
+        # profile and serialized with it when profiles are cached
+        if not debugMessages in self.privateImpls:
+            self.privateImpls[debugMessages] = self.gen_privateImpl(debugMessages, structFuncs if structFuncs != None else dict())
+        return self.privateImpls[debugMessages]
+
+
+    def gen_privateImpl(self, debugMessages, structFuncs):
         uname = self.name.upper()
         gen = '\n'
         gen += ('#ifdef {0}\n'
@@ -2410,17 +3719,64 @@ class VulkanProfile():
         gen += self.gen_extensionData('device')
         gen += self.gen_fallbackData()
         gen += self.gen_structTypeData()
-        gen += self.gen_structDesc(debugMessages)
+        gen += self.gen_structDesc(debugMessages, self.capabilities, structFuncs)
+        gen += self.gen_structChainerDesc()
+        gen += self.gen_alternativeData(debugMessages, structFuncs)
         gen += ('\n'
                 '}} // namespace {0}\n'
                 '#endif\n').format(uname)
         return gen
 
-    def gen_extensionData(self, type):
+
+    def gen_alternativeData(self, debugMessages, structFuncs):
+        # Only the requirements specific to each alternative are generated, the common part of the
+        # alternatives is part of the data generated for the profile itself
+        gen = ''
+        descs = []
+        for groupIndex, group in enumerate(self.capabilities.alternatives):
+            for altIndex, caps in enumerate(group):
+                altName = 'alternative{0}_{1}'.format(groupIndex, altIndex)
+                gen += ('\n'
+                        'namespace {0} {{\n').format(altName)
+                gen += self.gen_extensionData('instance', caps)
+                gen += self.gen_extensionData('device', caps)
+                gen += self.gen_structDesc(debugMessages, caps, structFuncs)
+                gen += ('\n'
+                        '}} // namespace {0}\n').format(altName)
+
+                desc = ('    VpAlternativeDesc{{\n'
+                        '        {0},\n').format(groupIndex)
+                desc += VulkanProfile.gen_dataArrayInfo(caps.instanceExtensions, '{0}::instanceExtensions'.format(altName))
+                desc += VulkanProfile.gen_dataArrayInfo(caps.deviceExtensions, '{0}::deviceExtensions'.format(altName))
+                desc += '        {0}::featureDesc,\n'.format(altName)
+                desc += '        {0}::propertyDesc,\n'.format(altName)
+                desc += VulkanProfile.gen_dataArrayInfo(self.structs.queueFamily and caps.queueFamiliesProperties, '{0}::queueFamilyDesc'.format(altName))
+                desc += VulkanProfile.gen_dataArrayInfo(self.structs.format and caps.formats, '{0}::formatDesc'.format(altName))
+                desc += '    },\n'
+                descs.append(desc)
+
+        if descs:
+            gen += ('\n'
+                    'static const VpAlternativeDesc alternatives[] = {\n')
+            gen += ''.join(descs)
+            gen += '};\n'
+        return gen
+
+
+    def gen_dataArrayInfo(condition, name):
+        if condition:
+            return '        &{0}[0], static_cast<uint32_t>(sizeof({0}) / sizeof({0}[0])),\n'.format(name)
+        else:
+            return '        nullptr, 0,\n'
+
+    def gen_extensionData(self, type, caps = None):
+        if caps == None:
+            caps = self.capabilities
         foundExt = False
         gen = '\n'
+        # The extensions are sorted by name as vpCheckExtension uses a binary search
         gen += 'static const VkExtensionProperties {0}Extensions[] = {{\n'.format(type)
-        for extName, specVer in sorted(self.capabilities.extensions.items()):
+        for extName, specVer in sorted(caps.extensions.items()):
             extInfo = self.registry.extensions[extName]
             if extInfo.type == type:
                 gen += '    VkExtensionProperties{{ {0}_EXTENSION_NAME, {1} }},\n'.format(extInfo.upperCaseName, specVer)
@@ -2645,7 +4001,16 @@ class VulkanProfile():
         return gen
 
 
-    def gen_structFunc(self, structDefs, caps, func, fmt, debugMessages = False):
+    def gen_structFunc(self, structFuncs, structDefs, caps, capsKey, func, fmt, debugMessages = False):
+        # Profiles generated with the same structFuncs share the code generated for equal capability data,
+        # identified by capsKey, which is derived from the section keys of the capabilities
+        key = (capsKey, tuple([ structDef.name for structDef in structDefs ]), func.__name__, fmt, debugMessages)
+        if not key in structFuncs:
+            structFuncs[key] = self.gen_structFuncCode(structDefs, caps, func, fmt, debugMessages)
+        return structFuncs[key]
+
+
+    def gen_structFuncCode(self, structDefs, caps, func, fmt, debugMessages = False):
         gen = ''
 
         hasData = False
@@ -2721,7 +4086,7 @@ class VulkanProfile():
 
 
 
-    def gen_structDesc(self, debugMessages):
+    def gen_structDesc(self, debugMessages, caps, structFuncs):
         gen = ''
 
         fillFmt = '{0};\n'
@@ -2736,11 +4101,11 @@ class VulkanProfile():
         gen += ('\n'
                 'static const VpFeatureDesc featureDesc = {\n'
                 '    [](VkBaseOutStructure* p) {\n')
-        gen += self.gen_structFunc(self.structs.feature, self.capabilities.features, self.gen_structFill, fillFmt)
+        gen += self.gen_structFunc(structFuncs, self.structs.feature, caps.features, caps.sectionKeys['features'], self.gen_structFill, fillFmt)
         gen += ('    },\n'
                 '    [](VkBaseOutStructure* p) -> bool {\n'
                 '        bool ret = true;\n')
-        gen += self.gen_structFunc(self.structs.feature, self.capabilities.features, self.gen_structCompare, cmpFmtFeatures, debugMessages)
+        gen += self.gen_structFunc(structFuncs, self.structs.feature, caps.features, caps.sectionKeys['features'], self.gen_structCompare, cmpFmtFeatures, debugMessages)
         gen += ('        return ret;\n'
                 '    }\n'
                 '};\n')
@@ -2754,37 +4119,37 @@ class VulkanProfile():
         gen += ('\n'
                 'static const VpPropertyDesc propertyDesc = {\n'
                 '    [](VkBaseOutStructure* p) {\n')
-        gen += self.gen_structFunc(self.structs.property, self.capabilities.properties, self.gen_structFill, fillFmt)
+        gen += self.gen_structFunc(structFuncs, self.structs.property, caps.properties, caps.sectionKeys['properties'], self.gen_structFill, fillFmt)
         gen += ('    },\n'
                 '    [](VkBaseOutStructure* p) -> bool {\n'
                 '        bool ret = true;\n')
-        gen += self.gen_structFunc(self.structs.property, self.capabilities.properties, self.gen_structCompare, cmpFmtProperties, debugMessages)
+        gen += self.gen_structFunc(structFuncs, self.structs.property, caps.properties, caps.sectionKeys['properties'], self.gen_structCompare, cmpFmtProperties, debugMessages)
         gen += ('        return ret;\n'
                 '    }\n'
                 '};\n')
 
         # Queue family descriptor
-        if self.structs.queueFamily:
+        if self.structs.queueFamily and caps.queueFamiliesProperties:
             gen += ('\n'
                     'static const VpQueueFamilyDesc queueFamilyDesc[] = {\n')
-            for queueFamilyCaps in self.capabilities.queueFamiliesProperties:
+            for queueFamilyIndex, queueFamilyCaps in enumerate(caps.queueFamiliesProperties):
                 gen += ('    {\n'
                         '        [](VkBaseOutStructure* p) {\n')
-                gen += self.gen_structFunc(self.structs.queueFamily, queueFamilyCaps, self.gen_structFill, fillFmt)
+                gen += self.gen_structFunc(structFuncs, self.structs.queueFamily, queueFamilyCaps, (caps.sectionKeys['queueFamiliesProperties'], queueFamilyIndex), self.gen_structFill, fillFmt)
                 gen += ('        },\n'
                         '        [](VkBaseOutStructure* p) -> bool {\n'
                         '            bool ret = true;\n')
-                gen += self.gen_structFunc(self.structs.queueFamily, queueFamilyCaps, self.gen_structCompare, cmpFmt)
+                gen += self.gen_structFunc(structFuncs, self.structs.queueFamily, queueFamilyCaps, (caps.sectionKeys['queueFamiliesProperties'], queueFamilyIndex), self.gen_structCompare, cmpFmt)
                 gen += ('            return ret;\n'
                         '        }\n'
                         '    },\n')
             gen += ('};\n')
 
         # Format descriptor
-        if self.structs.format:
+        if self.structs.format and caps.formats:
             gen += ('\n'
                     'static const VpFormatDesc formatDesc[] = {\n')
-            for formatName, formatCaps in sorted(self.capabilities.formats.items()):
+            for formatName, formatCaps in sorted(caps.formats.items()):
                 if debugMessages:
                     cmpFmtFormat = 'ret = ret && ({0}); VP_DEBUG_COND_MSG(!({0}), "Unsupported format condition for ' + formatName + ': {0}");\n'
                 else:
@@ -2793,25 +4158,16 @@ class VulkanProfile():
                 gen += ('    {{\n'
                         '        {0},\n'
                         '        [](VkBaseOutStructure* p) {{\n').format(formatName)
-                gen += self.gen_structFunc(self.structs.format, formatCaps, self.gen_structFill, fillFmt)
+                gen += self.gen_structFunc(structFuncs, self.structs.format, formatCaps, (caps.sectionKeys['formats'], formatName), self.gen_structFill, fillFmt)
                 gen += ('        },\n'
                         '        [](VkBaseOutStructure* p) -> bool {\n'
                         '            bool ret = true;\n')
-                gen += self.gen_structFunc(self.structs.format, formatCaps, self.gen_structCompare, cmpFmtFormat, debugMessages)
+                gen += self.gen_structFunc(structFuncs, self.structs.format, formatCaps, (caps.sectionKeys['formats'], formatName), self.gen_structCompare, cmpFmtFormat, debugMessages)
                 gen += ('            return ret;\n'
                         '        }\n'
                         '    },\n')
             gen += '};\n'
 
-        # Structure chaining descriptors
-        gen += ('\n'
-                'static const VpStructChainerDesc chainerDesc = {\n')
-        gen += self.gen_structChainerFunc(self.structs.feature, 'VkPhysicalDeviceFeatures2KHR')
-        gen += self.gen_structChainerFunc(self.structs.property, 'VkPhysicalDeviceProperties2KHR')
-        gen += self.gen_structChainerFunc(self.structs.queueFamily, 'VkQueueFamilyProperties2KHR')
-        gen += self.gen_structChainerFunc(self.structs.format, 'VkFormatProperties2KHR')
-        gen += '};\n'
-
         # If debug messages are needed do further prettifying (warning: obscure regular expressions follow)
         if debugMessages:
             # Prettify structure references in non-bitmask comparisons
@@ -2822,28 +4178,472 @@ class VulkanProfile():
         return gen
 
 
+    def gen_structChainerDesc(self):
+        # Structure chaining descriptors
+        gen = ('\n'
+               'static const VpStructChainerDesc chainerDesc = {\n')
+        gen += self.gen_structChainerFunc(self.structs.feature, 'VkPhysicalDeviceFeatures2KHR')
+        gen += self.gen_structChainerFunc(self.structs.property, 'VkPhysicalDeviceProperties2KHR')
+        gen += self.gen_structChainerFunc(self.structs.queueFamily, 'VkQueueFamilyProperties2KHR')
+        gen += self.gen_structChainerFunc(self.structs.format, 'VkFormatProperties2KHR')
+        gen += '};\n'
+        return gen
+
+
+class VulkanProfilesValidator():
+    def __init__(self, schema, cacheDir = None, specialized = False):
+        self.schema = schema
+        self.specialized = specialized
+        self.validator = None
+        self.cacheFile = None
+        self.results = dict()
+        self.modified = False
+        if cacheDir != None:
+            # Validation results only remain valid for the same schema and validator
+            schemaKey = hashlib.sha256((json.dumps(schema) + str(specialized)).encode('utf-8')).hexdigest()
+            self.cacheFile = os.path.join(cacheDir, 'profiles_validation_{0}.json'.format(schemaKey))
+            if os.path.isfile(self.cacheFile):
+                try:
+                    with open(self.cacheFile, 'r') as f:
+                        self.results = json.load(f)
+                except Exception as e:
+                    Log.w("Ignoring invalid profile validation cache file '{0}': {1}".format(self.cacheFile, e))
+
+
+    def __getstate__(self):
+        # The compiled validator is not serialized, worker processes compile their own
+        state = self.__dict__.copy()
+        state['validator'] = None
+        return state
+
+
+    def getFileKey(data):
+        return hashlib.sha256(data).hexdigest()
+
+
+    def getFileKeyFromFile(fileAbsPath):
+        hash = hashlib.sha256()
+        with open(fileAbsPath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hash.update(chunk)
+        return hash.hexdigest()
+
+
+    def getCachedErrors(self, fileKey):
+        return self.results.get(fileKey)
+
+
+    def validate(self, jsonData, fileKey):
+        errors = self.getCachedErrors(fileKey)
+        if errors is None:
+            if self.specialized:
+                if self.validator is None:
+                    self.validator = VulkanProfilesValidatorGenerator.compile(self.schema)
+                errors = self.validator(jsonData)
+            else:
+                if self.validator is None:
+                    # Compiling the validator resolves the schema once, instead of once per validated file
+                    self.validator = jsonschema.Draft7Validator(self.schema)
+                errors = []
+                for error in self.validator.iter_errors(jsonData):
+                    path = '/' + '/'.join([ str(element) for element in error.absolute_path ])
+                    errors.append("'{0}': {1}".format(path, error.message))
+            self.setErrors(fileKey, errors)
+        return errors
+
+
+    def setErrors(self, fileKey, errors):
+        if self.results.get(fileKey) != errors:
+            self.results[fileKey] = errors
+            self.modified = True
+
+
+    def store(self):
+        if self.cacheFile is None or not self.modified:
+            return
+        cacheDir = os.path.dirname(self.cacheFile)
+        os.makedirs(cacheDir, exist_ok = True)
+        fd, tmpFile = tempfile.mkstemp(dir = cacheDir, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.results, f)
+            os.replace(tmpFile, self.cacheFile)
+        except:
+            os.remove(tmpFile)
+            raise
+        self.modified = False
+
+
+class VulkanJsonObjectReader():
+    # Strings, including the colon following object keys, and brackets are the only tokens that
+    # matter for locating the members of an object, anything else is skipped by the scanner
+    tokenPattern = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"(\s*:)?|[{}\[\]]', re.DOTALL)
+
+
+    def __init__(self, fileAbsPath, memoize):
+        self.fileAbsPath = fileAbsPath
+        self.memoize = memoize
+        self.members = OrderedDict()
+        self.values = dict()
+
+
+    def load(fileAbsPath, lazyMembers = [ 'capabilities' ]):
+        # Only locates the members of the top level object of the JSON file without decoding them,
+        # and the members of the top level members listed in lazyMembers, so that each of these can
+        # be decoded on its own when accessed
+        root = VulkanJsonObjectReader(fileAbsPath, True)
+        with open(fileAbsPath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+                depth = 0
+                objects = [ root ]
+                key = None
+                start = None
+                for match in VulkanJsonObjectReader.tokenPattern.finditer(data):
+                    token = match.group(0)[:1]
+                    if token == b'"':
+                        if match.group(1) != None and depth == len(objects):
+                            if start != None:
+                                objects[-1].members[key] = (start, match.start())
+                            key = json.loads(data[match.start():match.start(1)])
+                            start = match.end()
+                    elif token == b'{' or token == b'[':
+                        depth += 1
+                        if depth == 2 and token == b'{' and key in lazyMembers:
+                            objects[-1].members[key] = VulkanJsonObjectReader(fileAbsPath, False)
+                            objects.append(objects[-1].members[key])
+                            key = None
+                            start = None
+                    else:
+                        if depth == len(objects):
+                            if start != None:
+                                objects[-1].members[key] = (start, match.start())
+                            if depth > 1:
+                                objects.pop()
+                                key = next(reversed(objects[-1].members))
+                                start = None
+                        depth -= 1
+        return root
+
+
+    def decode(self, location):
+        start, end = location
+        with open(self.fileAbsPath, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start).strip()
+        # The location of a member ends where the next member starts, so it includes the separator
+        if data.endswith(b','):
+            data = data[:-1]
+        return json.loads(data)
+
+
+    def __contains__(self, key):
+        return key in self.members
+
+
+    def __iter__(self):
+        return iter(self.members)
+
+
+    def __len__(self):
+        return len(self.members)
+
+
+    def __getitem__(self, key):
+        if key in self.values:
+            return self.values[key]
+        value = self.members[key]
+        if not isinstance(value, VulkanJsonObjectReader):
+            value = self.decode(value)
+            if self.memoize:
+                self.values[key] = value
+        return value
+
+
+    def get(self, key, default = None):
+        return self[key] if key in self.members else default
+
+
+    def keys(self):
+        return self.members.keys()
+
+
+    def items(self):
+        for key in self.members:
+            yield key, self[key]
+
+
+class VulkanProfileUnpickler(VulkanRegistryUnpickler):
+    # Cached profiles reference registry definitions by name only, so on top of the basic registry
+    # types only the profile classes themselves are expected
+    allowedClasses = VulkanRegistryUnpickler.allowedClasses + [
+        'VulkanProfile', 'VulkanProfileCapabilities', 'VulkanProfileStructs'
+    ]
+
+
+class VulkanProfileCache():
+    def __init__(self, cacheDir, registryKey):
+        # The registry key covers both the registry and this script, so the cached profiles are
+        # only reused when they would be derived the exact same way
+        self.cacheDir = cacheDir
+        self.registryKey = registryKey
+        self.entries = dict()
+
+
+    def getCacheFile(self, fileKey):
+        key = hashlib.sha256((fileKey + self.registryKey).encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheDir, 'vk_profiles_{0}.pickle'.format(key))
+
+
+    def getImplCount(profiles):
+        return sum([ len(profile.privateImpls) for profile in profiles.values() ])
+
+
+    def load(self, registry, fileKey, validated):
+        # Profiles cached without validation are not used when validation is requested
+        cacheFile = self.getCacheFile(fileKey)
+        if not os.path.isfile(cacheFile):
+            return None
+        try:
+            with open(cacheFile, 'rb') as f:
+                entry = VulkanProfileUnpickler(f).load()
+            if validated and not entry['validated']:
+                return None
+            profiles = entry['profiles']
+            for profile in profiles.values():
+                profile.attachRegistry(registry)
+        except Exception as e:
+            Log.w("Ignoring invalid profile cache file '{0}': {1}".format(cacheFile, e))
+            return None
+        self.entries[fileKey] = (profiles, entry['validated'], VulkanProfileCache.getImplCount(profiles))
+        return profiles
+
+
+    def add(self, fileKey, profiles, validated):
+        self.entries[fileKey] = (profiles, validated, None)
+
+
+    def store(self):
+        # Entries are written when new, or when code got generated for them since they were loaded
+        os.makedirs(self.cacheDir, exist_ok = True)
+        for fileKey, (profiles, validated, implCount) in self.entries.items():
+            if implCount == VulkanProfileCache.getImplCount(profiles):
+                continue
+            fd, tmpFile = tempfile.mkstemp(dir = self.cacheDir, suffix = '.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump({ 'validated': validated, 'profiles': profiles }, f, protocol = pickle.HIGHEST_PROTOCOL)
+                os.replace(tmpFile, self.getCacheFile(fileKey))
+            except:
+                os.remove(tmpFile)
+                raise
+            self.entries[fileKey] = (profiles, validated, VulkanProfileCache.getImplCount(profiles))
+
+
+class VulkanProfileIndex():
+    def __init__(self, indexFile):
+        # The index records the profiles defined by each profile file of a directory, along with the
+        # modification time, size and hash of the file used to detect which files need reindexing
+        self.indexFile = indexFile
+        self.directory = None
+        self.files = OrderedDict()
+        self.names = dict()
+        if os.path.isfile(indexFile):
+            try:
+                with open(indexFile, 'r') as f:
+                    data = json.load(f)
+                self.directory = data['directory']
+                self.files = OrderedDict(data['files'])
+            except Exception as e:
+                Log.w("Ignoring invalid profile index file '{0}': {1}".format(indexFile, e))
+
+
+    def update(self, profilesDir):
+        dirAbsPath = os.path.abspath(profilesDir)
+        if self.directory != dirAbsPath:
+            self.files = OrderedDict()
+        modified = self.directory != dirAbsPath
+        files = OrderedDict()
+        for filename in os.listdir(dirAbsPath):
+            fileAbsPath = os.path.join(dirAbsPath, filename)
+            if not os.path.isfile(fileAbsPath) or os.path.splitext(filename)[-1] != '.json':
+                continue
+            stat = os.stat(fileAbsPath)
+            entry = self.files.get(filename)
+            if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                # Only files with modified contents need to be read again
+                fileKey = VulkanProfilesValidator.getFileKeyFromFile(fileAbsPath)
+                if entry is None or entry['hash'] != fileKey:
+                    entry = self.readFile(fileAbsPath, fileKey)
+                entry['mtime'] = stat.st_mtime_ns
+                entry['size'] = stat.st_size
+                modified = True
+            files[filename] = entry
+        modified = modified or list(files) != list(self.files)
+
+        self.directory = dirAbsPath
+        self.files = files
+        self.names = dict()
+        for filename, entry in self.files.items():
+            for name in entry['profiles']:
+                self.names.setdefault(name, filename)
+        if modified:
+            self.store()
+
+
+    def readFile(self, fileAbsPath, fileKey):
+        Log.i("Indexing profile file: '{0}'".format(os.path.basename(fileAbsPath)))
+        profiles = dict()
+        jsonProfiles = VulkanJsonObjectReader.load(fileAbsPath, []).get('profiles')
+        if isinstance(jsonProfiles, dict):
+            for name, data in jsonProfiles.items():
+                profiles[name] = {
+                    'capabilities': data.get('capabilities'),
+                    'api-version': data.get('api-version')
+                }
+        return { 'hash': fileKey, 'profiles': profiles }
+
+
+    def getFiles(self, profileNames):
+        # Returns the files defining the profiles in directory order, profiles that are not found
+        # are expected to be reported by the caller
+        filenames = set([ self.names[name] for name in profileNames if name in self.names ])
+        return [ filename for filename in self.files if filename in filenames ]
+
+
+    def store(self):
+        indexDir = os.path.dirname(os.path.abspath(self.indexFile))
+        os.makedirs(indexDir, exist_ok = True)
+        fd, tmpFile = tempfile.mkstemp(dir = indexDir, suffix = '.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({ 'directory': self.directory, 'files': self.files }, f)
+            os.replace(tmpFile, self.indexFile)
+        except:
+            os.remove(tmpFile)
+            raise
+        Log.i("Stored profile index file: '{0}'".format(self.indexFile))
+
+
 class VulkanProfiles():
-    def loadFromDir(registry, profilesDir, validate, schema):
+    def loadFromDir(registry, profilesDir, validate, schema, jobs = 1, validationCacheDir = None, specializedValidator = False,
+                    profileCache = None, streaming = False, profileNames = None, profileIndex = None):
         profiles = dict()
         dirAbsPath = os.path.abspath(profilesDir)
-        filenames = os.listdir(dirAbsPath)
-        for filename in filenames:
-            fileAbsPath = os.path.join(dirAbsPath, filename)
-            if os.path.isfile(fileAbsPath) and os.path.splitext(filename)[-1] == '.json':
-                Log.i("Loading profile file: '{0}'".format(filename))
-                with open(fileAbsPath, 'r') as f:
-                    jsonData = json.load(f)
-                    if validate:
-                        Log.i("Validating profile file: '{0}'".format(filename))
-                        # jsonschema.validate(jsonData, schema)
-                    VulkanProfiles.parseProfiles(registry, profiles, jsonData['profiles'], jsonData['capabilities'])
+        fileAbsPaths = []
+        if profileNames != None and profileIndex != None:
+            # Only the files defining the requested profiles are opened
+            profileIndex.update(dirAbsPath)
+            for filename in profileIndex.getFiles(profileNames):
+                fileAbsPaths.append(os.path.join(dirAbsPath, filename))
+        else:
+            for filename in os.listdir(dirAbsPath):
+                fileAbsPath = os.path.join(dirAbsPath, filename)
+                if os.path.isfile(fileAbsPath) and os.path.splitext(filename)[-1] == '.json':
+                    fileAbsPaths.append(fileAbsPath)
+
+        validator = VulkanProfilesValidator(schema, validationCacheDir, specializedValidator) if validate else None
+
+        # Profiles loaded by this call share the capability sections merged from the same blocks
+        mergedSections = dict()
+
+        # Files with unchanged contents are taken from the profile cache, and only the remaining
+        # ones are loaded
+        fileProfiles = [ None ] * len(fileAbsPaths)
+        if profileCache != None:
+            for index, fileAbsPath in enumerate(fileAbsPaths):
+                fileKey = VulkanProfilesValidator.getFileKeyFromFile(fileAbsPath)
+                fileProfiles[index] = profileCache.load(registry, fileKey, validator != None)
+                if fileProfiles[index] != None:
+                    Log.i("Loaded profile file '{0}' from cache".format(os.path.basename(fileAbsPath)))
+        loadIndices = [ index for index in range(len(fileAbsPaths)) if fileProfiles[index] is None ]
+        loadAbsPaths = [ fileAbsPaths[index] for index in loadIndices ]
+
+        invalidFiles = []
+        if jobs > 1 and len(loadAbsPaths) > 1:
+            # The registry is passed to each worker process once, and the profiles loaded from each
+            # file are registered in the same order as when loading them serially
+            registry.loadAllSections()
+            with concurrent.futures.ProcessPoolExecutor(max_workers = jobs, initializer = VulkanProfiles.initWorker,
+                                                        initargs = (registry, validator, streaming)) as executor:
+                results = list(executor.map(VulkanProfiles.loadFileInWorker, loadAbsPaths))
+            for loadedProfiles, fileKey, errors in results:
+                if validator != None:
+                    validator.setErrors(fileKey, errors)
+                for profile in loadedProfiles.values():
+                    profile.attachRegistry(registry)
+        else:
+            results = [ VulkanProfiles.loadFile(registry, fileAbsPath, validator, streaming, mergedSections) for fileAbsPath in loadAbsPaths ]
+
+        for index, (loadedProfiles, fileKey, errors) in zip(loadIndices, results):
+            if len(errors) > 0:
+                invalidFiles.append(os.path.basename(fileAbsPaths[index]))
+            else:
+                fileProfiles[index] = loadedProfiles
+                if profileCache != None:
+                    profileCache.add(fileKey, loadedProfiles, validator != None)
+
+        for loadedProfiles in fileProfiles:
+            if loadedProfiles != None:
+                profiles.update(loadedProfiles)
+
+        if validator != None:
+            validator.store()
+        if len(invalidFiles) > 0:
+            Log.f("Validation failed for profile files: {0}".format(', '.join(invalidFiles)))
+
+        if validate:
+            # Profiles are otherwise resolved on first use, but validation has to check all of them
+            for profile in profiles.values():
+                profile.resolve()
+
+        if profileNames != None:
+            missingNames = [ name for name in profileNames if not name in profiles ]
+            if len(missingNames) > 0:
+                Log.f("Profiles not found in directory '{0}': {1}".format(profilesDir, ', '.join(missingNames)))
+            profiles = { name: profiles[name] for name in profileNames }
         return profiles
 
 
-    def parseProfiles(registry, profiles, json, caps):
+    def loadFile(registry, fileAbsPath, validator = None, streaming = False, mergedSections = None):
+        profiles = dict()
+        filename = os.path.basename(fileAbsPath)
+        Log.i("Loading profile file: '{0}'".format(filename))
+        if streaming:
+            fileKey = VulkanProfilesValidator.getFileKeyFromFile(fileAbsPath)
+        if streaming and (validator is None or validator.getCachedErrors(fileKey) != None):
+            # Validating a file needs the whole document, but otherwise only the profiles and the
+            # capability blocks they reference get decoded
+            jsonData = VulkanJsonObjectReader.load(fileAbsPath)
+        else:
+            with open(fileAbsPath, 'rb') as f:
+                data = f.read()
+            fileKey = VulkanProfilesValidator.getFileKey(data)
+            jsonData = json.loads(data)
+        errors = []
+        if validator != None:
+            Log.i("Validating profile file: '{0}'".format(filename))
+            errors = validator.validate(jsonData, fileKey)
+            for error in errors:
+                Log.e("Profile file '{0}' is invalid at {1}".format(filename, error))
+        # Invalid profile files are not parsed any further, so that all of them get reported
+        if len(errors) == 0:
+            VulkanProfiles.parseProfiles(registry, profiles, jsonData['profiles'], jsonData['capabilities'], mergedSections)
+        return profiles, fileKey, errors
+
+
+    def initWorker(registry, validator, streaming):
+        VulkanProfiles.workerArgs = (registry, validator, streaming, dict())
+
+
+    def loadFileInWorker(fileAbsPath):
+        registry, validator, streaming, mergedSections = VulkanProfiles.workerArgs
+        return VulkanProfiles.loadFile(registry, fileAbsPath, validator, streaming, mergedSections)
+
+
+    def parseProfiles(registry, profiles, json, caps, mergedSections = None):
         for name, data in json.items():
             Log.i("Registering profile '{0}'".format(name))
-            profiles[name] = VulkanProfile(registry, name, data, caps)
+            profiles[name] = VulkanProfile(registry, name, data, caps, mergedSections)
 
 
 class VulkanProfilesLibraryGenerator():
@@ -2851,6 +4651,8 @@ class VulkanProfilesLibraryGenerator():
         self.registry = registry
         self.profiles = profiles
         self.debugMessages = debugMessages
+        # Code generated for equal capability data, shared by the profiles of this generator
+        self.structFuncs = dict()
 
 
     def patch_code(self, code):
@@ -2954,6 +4756,7 @@ class VulkanProfilesLibraryGenerator():
         gen += PRIVATE_DEFS
         gen += self.gen_profilePrivateImpl()
         gen += self.gen_profileDescTable()
+        gen += self.gen_structSizes()
         gen += PRIVATE_IMPL_BODY
         gen += '\n} // namespace detail\n'
         return self.patch_code(gen)
@@ -2962,21 +4765,16 @@ class VulkanProfilesLibraryGenerator():
     def gen_profilePrivateImpl(self):
         gen = ''
         for _, profile in sorted(self.profiles.items()):
-            gen += profile.generatePrivateImpl(self.debugMessages)
+            gen += profile.generatePrivateImpl(self.debugMessages, self.structFuncs)
         return gen
 
 
-    def gen_dataArrayInfo(self, condition, name):
-        if condition:
-            return '        &{0}[0], static_cast<uint32_t>(sizeof({0}) / sizeof({0}[0])),\n'.format(name)
-        else:
-            return '        nullptr, 0,\n'
-
-
     def gen_profileDescTable(self):
         gen = '\n'
         gen += 'static const VpProfileDesc vpProfiles[] = {\n'
 
+        # Profile names are ASCII so sorting them here matches the strncmp order used by the
+        # binary search of vpGetProfileDesc
         for name, profile in sorted(self.profiles.items()):
             uname = name.upper()
             gen += ('#ifdef {0}\n'
@@ -2984,18 +4782,20 @@ class VulkanProfilesLibraryGenerator():
                     '        VpProfileProperties{{ {1}_NAME, {1}_SPEC_VERSION }},\n'
                     '        {1}_MIN_API_VERSION,\n').format(name, uname)
 
-            gen += self.gen_dataArrayInfo(profile.capabilities.instanceExtensions, '{0}::instanceExtensions'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.capabilities.deviceExtensions, '{0}::deviceExtensions'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.fallback, '{0}::fallbacks'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.structs.feature, '{0}::featureStructTypes'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.capabilities.instanceExtensions, '{0}::instanceExtensions'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.capabilities.deviceExtensions, '{0}::deviceExtensions'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.fallback, '{0}::fallbacks'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.feature, '{0}::featureStructTypes'.format(uname))
             gen += '        {0}::featureDesc,\n'.format(uname)
-            gen += self.gen_dataArrayInfo(profile.structs.property, '{0}::propertyStructTypes'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.property, '{0}::propertyStructTypes'.format(uname))
             gen += '        {0}::propertyDesc,\n'.format(uname)
-            gen += self.gen_dataArrayInfo(profile.structs.queueFamily, '{0}::queueFamilyStructTypes'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.structs.queueFamily, '{0}::queueFamilyDesc'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.structs.format, '{0}::formatStructTypes'.format(uname))
-            gen += self.gen_dataArrayInfo(profile.structs.format, '{0}::formatDesc'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.queueFamily, '{0}::queueFamilyStructTypes'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.queueFamily and profile.capabilities.queueFamiliesProperties, '{0}::queueFamilyDesc'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.format, '{0}::formatStructTypes'.format(uname))
+            gen += VulkanProfile.gen_dataArrayInfo(profile.structs.format and profile.capabilities.formats, '{0}::formatDesc'.format(uname))
             gen += '        {0}::chainerDesc,\n'.format(uname)
+            gen += VulkanProfile.gen_dataArrayInfo(profile.capabilities.alternatives, '{0}::alternatives'.format(uname))
+            gen += '        {0},\n'.format(len(profile.capabilities.alternatives))
 
             gen += ('    },\n'
                     '#endif\n')
@@ -3005,6 +4805,46 @@ class VulkanProfilesLibraryGenerator():
         return gen
 
 
+    def gen_structSizes(self):
+        # Collect the structures that may be queried from the driver, grouped by their aliases as
+        # they share the same structure type
+        structGroups = dict()
+        for name in [ 'VkPhysicalDeviceFeatures2', 'VkPhysicalDeviceProperties2', 'VkFormatProperties2', 'VkQueueFamilyProperties2' ]:
+            structGroups[self.registry.structs[name].aliases[0]] = self.registry.structs[name].aliases
+        for _, profile in sorted(self.profiles.items()):
+            for structDef in profile.structs.feature + profile.structs.property + profile.structs.queueFamily + profile.structs.format:
+                structGroups[structDef.aliases[0]] = structDef.aliases
+
+        gen = '\n'
+        gen += ('VPAPI_ATTR size_t vpGetStructSize(VkStructureType type) {\n'
+                '    switch (type) {\n')
+        for _, aliases in sorted(structGroups.items()):
+            # Use the first alias that is defined by the Vulkan headers used to compile the library
+            conditional = False
+            for name in aliases:
+                structDef = self.registry.structs[name]
+                conditions = []
+                if structDef.definedByVersion != None:
+                    conditions.append(structDef.definedByVersion.define)
+                conditions += structDef.definedByExtensions
+                case = '        case {0}: return sizeof({1});\n'.format(structDef.sType, structDef.name)
+                if conditions:
+                    gen += '#{0} {1}\n'.format('elif' if conditional else 'if', ' || '.join([ 'defined({0})'.format(c) for c in conditions ]))
+                    gen += case
+                    conditional = True
+                else:
+                    if conditional:
+                        gen += '#else\n'
+                    gen += case
+                    break
+            if conditional:
+                gen += '#endif\n'
+        gen += ('        default: return 0;\n'
+                '    }\n'
+                '}\n')
+        return gen
+
+
     def gen_publicImpl(self):
         gen = PUBLIC_IMPL_BODY
         return self.patch_code(gen)
@@ -3027,6 +4867,12 @@ class VulkanProfilesSchemaGenerator():
             f.write(json.dumps(self.schema, indent=4))
 
 
+    def generateValidator(self, outValidator):
+        Log.i("Generating '{0}'...".format(outValidator))
+        with open(outValidator, 'w') as f:
+            f.write(VulkanProfilesValidatorGenerator(self.schema).gen_module())
+
+
     def gen_schema(self):
         definitions = self.gen_baseDefinitions()
         extensions = self.gen_extensions()
@@ -3471,9 +5317,8 @@ class VulkanProfilesSchemaGenerator():
     def gen_structChainDefinitions(self, basename, definitions):
         # Collect unique chainable structures (ignoring aliases)
         structNames = [ basename, basename + '2' ]
-        for structName in sorted(self.registry.structs.keys()):
-            structDef = self.registry.structs[structName]
-            if not structDef.isAlias and basename + '2' in structDef.extends:
+        for structName in sorted(self.registry.structsByExtends.get(basename + '2', [])):
+            if not self.registry.structs[structName].isAlias:
                 structNames.append(structName)
 
         # Generate structure definitions and references
@@ -3520,6 +5365,313 @@ class VulkanProfilesSchemaGenerator():
         return self.gen_structChainDefinitions("VkQueueFamilyProperties", definitions)
 
 
+class VulkanProfilesValidatorGenerator():
+    # Generates a Python module validating JSON profiles against the given schema, with the checks
+    # of each object definition emitted as straight-line code. Only the JSON schema keywords used
+    # by the generated profiles schema are supported
+    typeChecks = {
+        'object': 'isinstance({0}, dict)',
+        'array': 'isinstance({0}, list)',
+        'string': 'isinstance({0}, str)',
+        'boolean': 'isinstance({0}, bool)',
+        'integer': 'isInteger({0})',
+        'number': 'isNumber({0})'
+    }
+
+    ignoredKeywords = [ '$schema', '$id', 'title', 'description' ]
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.definitions = schema.get('definitions', dict())
+        self.constants = []
+        self.constantNames = dict()
+        self.functions = []
+        self.functionNames = dict()
+        self.anonymousCount = 0
+
+
+    def gen_module(self):
+        rootFunction = self.gen_function(self.schema, 'check_root')
+        gen = ('# Generated by gen_profiles_solution.py from the Vulkan profiles JSON schema, do not edit\n'
+               'import re\n'
+               '\n'
+               '\n'
+               'def isInteger(value):\n'
+               '    if isinstance(value, bool):\n'
+               '        return False\n'
+               '    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())\n'
+               '\n'
+               '\n'
+               'def isNumber(value):\n'
+               '    return isinstance(value, (int, float)) and not isinstance(value, bool)\n'
+               '\n'
+               '\n'
+               'def isEqual(a, b):\n'
+               '    if isinstance(a, bool) != isinstance(b, bool):\n'
+               '        return False\n'
+               '    if isinstance(a, dict) and isinstance(b, dict):\n'
+               '        return a.keys() == b.keys() and all([ isEqual(a[key], b[key]) for key in a ])\n'
+               '    if isinstance(a, list) and isinstance(b, list):\n'
+               '        return len(a) == len(b) and all([ isEqual(x, y) for x, y in zip(a, b) ])\n'
+               '    return a == b\n'
+               '\n'
+               '\n'
+               'def isUnique(items):\n'
+               '    if all([ isinstance(item, str) for item in items ]):\n'
+               '        return len(set(items)) == len(items)\n'
+               '    for i in range(len(items)):\n'
+               '        for j in range(i + 1, len(items)):\n'
+               '            if isEqual(items[i], items[j]):\n'
+               '                return False\n'
+               '    return True\n'
+               '\n'
+               '\n')
+        for name, value in self.constants:
+            gen += '{0} = {1}\n'.format(name, value)
+        for function in self.functions:
+            gen += '\n\n' + function
+        gen += ('\n\n'
+                'def validate(data):\n'
+                '    errors = []\n'
+                '    {0}(data, \'\', errors)\n'
+                '    return [ "\'{{0}}\': {{1}}".format(path if path else \'/\', message) for path, message in errors ]\n').format(rootFunction)
+        return gen
+
+
+    def compile(schema):
+        # Returns the validate function of the generated module, without writing it to disk
+        namespace = dict()
+        exec(compile(VulkanProfilesValidatorGenerator(schema).gen_module(), '<profiles validator>', 'exec'), namespace)
+        return namespace['validate']
+
+
+    def gen_constant(self, prefix, value):
+        if not value in self.constantNames:
+            name = '{0}_{1}'.format(prefix, len(self.constants))
+            self.constants.append((name, value))
+            self.constantNames[value] = name
+        return self.constantNames[value]
+
+
+    def gen_function(self, schema, name = None):
+        key = name if name != None else id(schema)
+        if key in self.functionNames:
+            return self.functionNames[key]
+        if name is None:
+            self.anonymousCount += 1
+            name = 'check_anonymous_{0}'.format(self.anonymousCount)
+        self.functionNames[key] = name
+
+        lines = [ 'def {0}(value, path, errors):'.format(name) ]
+        body = self.gen_bodyChecks(self.resolve(schema), 'value', 'path', 1, 1)
+        lines.extend(body if len(body) > 0 else [ '    pass' ])
+        self.functions.append('\n'.join(lines) + '\n')
+        return name
+
+
+    def gen_refFunction(self, ref):
+        name = self.getRefName(ref)
+        return self.gen_function(self.definitions[name], 'check_' + re.sub(r'\W', '_', name))
+
+
+    def getRefName(self, ref):
+        if not ref.startswith('#/definitions/') or not ref[len('#/definitions/'):] in self.definitions:
+            Log.f("Unsupported schema reference '{0}'".format(ref))
+        return ref[len('#/definitions/'):]
+
+
+    def resolve(self, schema):
+        while '$ref' in schema:
+            schema = self.definitions[self.getRefName(schema['$ref'])]
+        return schema
+
+
+    def isObject(self, schema):
+        return schema.get('type') == 'object' or len(set(schema.keys()) & set([ 'properties', 'patternProperties', 'additionalProperties', 'required' ])) > 0
+
+
+    def isInline(self, schema):
+        # Objects and alternatives get their own functions, everything else is checked inline
+        schema = self.resolve(schema)
+        if self.isObject(schema) or 'anyOf' in schema:
+            return False
+        if 'items' in schema:
+            return self.isInline(schema['items'])
+        return True
+
+
+    def gen_error(self, pathExpr, messageFormat, var, indent):
+        # The message is formatted with the invalid value only when the error is reported
+        return [ '    ' * indent + 'errors.append(({0}, {1}.format({2})))'.format(pathExpr, repr(messageFormat), var) ]
+
+
+    def escape(self, text):
+        return str(text).replace('{', '{{').replace('}', '}}')
+
+
+    def gen_checks(self, schema, var, pathExpr, indent, depth):
+        if self.isInline(schema):
+            return self.gen_bodyChecks(self.resolve(schema), var, pathExpr, indent, depth)
+        elif '$ref' in schema:
+            function = self.gen_refFunction(schema['$ref'])
+        else:
+            function = self.gen_function(schema)
+        return [ '    ' * indent + '{0}({1}, {2}, errors)'.format(function, var, pathExpr) ]
+
+
+    def gen_bodyChecks(self, schema, var, pathExpr, indent, depth):
+        for keyword in schema:
+            if not keyword in self.ignoredKeywords and not keyword in [
+                'type', 'enum', 'minimum', 'maximum', 'maxLength', 'pattern', 'items', 'minItems', 'maxItems',
+                'uniqueItems', 'properties', 'patternProperties', 'additionalProperties', 'required', 'anyOf',
+                'definitions' ]:
+                Log.f("Unsupported JSON schema keyword '{0}'".format(keyword))
+
+        lines = []
+        prefix = '    ' * indent
+        if 'anyOf' in schema:
+            functions = []
+            for alternative in schema['anyOf']:
+                if '$ref' in alternative:
+                    functions.append(self.gen_refFunction(alternative['$ref']))
+                else:
+                    functions.append(self.gen_function(alternative))
+            lines.append(prefix + 'for check in ({0},):'.format(', '.join(functions)))
+            lines.append(prefix + '    alternativeErrors = []')
+            lines.append(prefix + '    check({0}, {1}, alternativeErrors)'.format(var, pathExpr))
+            lines.append(prefix + '    if len(alternativeErrors) == 0:')
+            lines.append(prefix + '        break')
+            lines.append(prefix + 'else:')
+            lines.extend(self.gen_error(pathExpr, '{0!r} is not valid under any of the given schemas', var, indent + 1))
+
+        if 'type' in schema:
+            checks = self.gen_typedChecks(schema, var, pathExpr, indent + 1, depth)
+            lines.append(prefix + 'if not {0}:'.format(self.typeChecks[schema['type']].format(var)))
+            lines.extend(self.gen_error(pathExpr, '{{0!r}} is not of type {0}'.format(self.escape(repr(schema['type']))), var, indent + 1))
+            if len(checks) > 0:
+                lines.append(prefix + 'else:')
+                lines.extend(checks)
+        else:
+            lines.extend(self.gen_typedChecks(schema, var, pathExpr, indent, depth))
+        return lines
+
+
+    def gen_guard(self, schema, type, var):
+        # Keywords only apply to values of matching type, which is known if the schema requires it
+        if schema.get('type') == type or (type == 'number' and schema.get('type') == 'integer'):
+            return ''
+        return '{0} and '.format(self.typeChecks[type].format(var))
+
+
+    def gen_typedChecks(self, schema, var, pathExpr, indent, depth):
+        lines = []
+        prefix = '    ' * indent
+
+        if 'enum' in schema:
+            values = schema['enum']
+            if all([ isinstance(value, str) for value in values ]):
+                constant = self.gen_constant('ENUM', 'frozenset({0})'.format(repr(sorted(values))))
+                lines.append(prefix + 'if not isinstance({0}, str) or not {0} in {1}:'.format(var, constant))
+            else:
+                constant = self.gen_constant('ENUM', repr(tuple(values)))
+                lines.append(prefix + 'if not any([ isEqual({0}, enumValue) for enumValue in {1} ]):'.format(var, constant))
+            lines.extend(self.gen_error(pathExpr, '{0!r} is not a valid enum value', var, indent + 1))
+
+        if 'minimum' in schema:
+            lines.append(prefix + 'if {0}{1} < {2}:'.format(self.gen_guard(schema, 'number', var), var, schema['minimum']))
+            lines.extend(self.gen_error(pathExpr, '{{0!r}} is less than the minimum of {0}'.format(schema['minimum']), var, indent + 1))
+        if 'maximum' in schema:
+            lines.append(prefix + 'if {0}{1} > {2}:'.format(self.gen_guard(schema, 'number', var), var, schema['maximum']))
+            lines.extend(self.gen_error(pathExpr, '{{0!r}} is greater than the maximum of {0}'.format(schema['maximum']), var, indent + 1))
+
+        if 'maxLength' in schema:
+            lines.append(prefix + 'if {0}len({1}) > {2}:'.format(self.gen_guard(schema, 'string', var), var, schema['maxLength']))
+            lines.extend(self.gen_error(pathExpr, '{0!r} is too long', var, indent + 1))
+        if 'pattern' in schema:
+            constant = self.gen_constant('PATTERN', 're.compile({0})'.format(repr(schema['pattern'])))
+            lines.append(prefix + 'if {0}{1}.search({2}) is None:'.format(self.gen_guard(schema, 'string', var), constant, var))
+            lines.extend(self.gen_error(pathExpr, '{{0!r}} does not match {0}'.format(self.escape(repr(schema['pattern']))), var, indent + 1))
+
+        if 'minItems' in schema:
+            lines.append(prefix + 'if {0}len({1}) < {2}:'.format(self.gen_guard(schema, 'array', var), var, schema['minItems']))
+            lines.extend(self.gen_error(pathExpr, '{0!r} is too short', var, indent + 1))
+        if 'maxItems' in schema:
+            lines.append(prefix + 'if {0}len({1}) > {2}:'.format(self.gen_guard(schema, 'array', var), var, schema['maxItems']))
+            lines.extend(self.gen_error(pathExpr, '{0!r} is too long', var, indent + 1))
+        if schema.get('uniqueItems') == True:
+            lines.append(prefix + 'if {0}not isUnique({1}):'.format(self.gen_guard(schema, 'array', var), var))
+            lines.extend(self.gen_error(pathExpr, '{0!r} has non-unique elements', var, indent + 1))
+        if 'items' in schema:
+            index = 'index{0}'.format(depth)
+            item = 'item{0}'.format(depth)
+            itemPathExpr = "{0} + '/' + str({1})".format(pathExpr, index)
+            if schema.get('type') == 'array':
+                itemChecks = self.gen_checks(schema['items'], item, itemPathExpr, indent + 1, depth + 1)
+                if len(itemChecks) > 0:
+                    lines.append(prefix + 'for {0}, {1} in enumerate({2}):'.format(index, item, var))
+                    lines.extend(itemChecks)
+            else:
+                itemChecks = self.gen_checks(schema['items'], item, itemPathExpr, indent + 2, depth + 1)
+                if len(itemChecks) > 0:
+                    lines.append(prefix + 'if isinstance({0}, list):'.format(var))
+                    lines.append(prefix + '    for {0}, {1} in enumerate({2}):'.format(index, item, var))
+                    lines.extend(itemChecks)
+
+        if schema.get('type') == 'object':
+            lines.extend(self.gen_objectChecks(schema, var, pathExpr, indent, depth))
+        elif self.isObject(schema):
+            # Object keywords only apply to objects when the type is not restricted
+            lines.append(prefix + 'if isinstance({0}, dict):'.format(var))
+            lines.extend(self.gen_objectChecks(schema, var, pathExpr, indent + 1, depth))
+        return lines
+
+
+    def gen_objectChecks(self, schema, var, pathExpr, indent, depth):
+        lines = []
+        prefix = '    ' * indent
+
+        for name in schema.get('required', []):
+            lines.append(prefix + 'if not {0} in {1}:'.format(repr(name), var))
+            lines.extend(self.gen_error(pathExpr, '{0!r} is a required property', repr(name), indent + 1))
+
+        # Straight-line checks for each of the known properties
+        properties = schema.get('properties', dict())
+        for name, propertySchema in properties.items():
+            item = 'item{0}'.format(depth)
+            itemPathExpr = "{0} + {1}".format(pathExpr, repr('/' + name))
+            checks = self.gen_checks(propertySchema, item, itemPathExpr, indent + 1, depth + 1)
+            if len(checks) > 0:
+                lines.append(prefix + 'if {0} in {1}:'.format(repr(name), var))
+                lines.append(prefix + '    {0} = {1}[{2}]'.format(item, var, repr(name)))
+                lines.extend(checks)
+
+        # Checks for the remaining properties
+        patterns = [ (self.gen_constant('PATTERN', 're.compile({0})'.format(repr(pattern))), patternSchema)
+                     for pattern, patternSchema in schema.get('patternProperties', dict()).items() ]
+        additional = schema.get('additionalProperties', True)
+        if len(patterns) > 0 or additional != True:
+            key = 'key{0}'.format(depth)
+            item = 'item{0}'.format(depth)
+            itemPathExpr = "{0} + '/' + {1}".format(pathExpr, key)
+            keys = self.gen_constant('KEYS', 'frozenset({0})'.format(repr(sorted(properties.keys()))))
+            lines.append(prefix + 'for {0}, {1} in {2}.items():'.format(key, item, var))
+            lines.append(prefix + '    if {0} in {1}:'.format(key, keys))
+            lines.append(prefix + '        continue')
+            if len(patterns) > 0:
+                lines.append(prefix + '    matched = False')
+                for pattern, patternSchema in patterns:
+                    lines.append(prefix + '    if {0}.search({1}) != None:'.format(pattern, key))
+                    lines.append(prefix + '        matched = True')
+                    lines.extend(self.gen_checks(patternSchema, item, itemPathExpr, indent + 2, depth + 1))
+                lines.append(prefix + '    if matched:')
+                lines.append(prefix + '        continue')
+            if additional == False:
+                lines.extend(self.gen_error(pathExpr, 'Additional properties are not allowed ({0!r} was unexpected)', key, indent + 1))
+            elif additional != True:
+                lines.extend(self.gen_checks(additional, item, itemPathExpr, indent + 1, depth + 1))
+        return lines
+
+
 DOC_MD_HEADER = '''
 <!-- markdownlint-disable MD041 -->
 <p align="left"><img src="https://vulkan.lunarg.com/img/NewLunarGLogoBlack.png" alt="LunarG" width=263 height=113 /></p>
@@ -4320,6 +6472,268 @@ class VulkanProfilesDocGenerator():
         return '\n## Vulkan Profile Formats\n\n{0}\n\n{1}\n{2}\n'.format(disclaimer, legend, table)
 
 
+class VulkanRegistrySubsetGenerator():
+    # Structures queried by the generated code or patched by VulkanRegistry.applyWorkarounds
+    # regardless of the profiles' contents
+    baseStructs = [
+        'VkPhysicalDeviceFeatures', 'VkPhysicalDeviceFeatures2',
+        'VkPhysicalDeviceProperties', 'VkPhysicalDeviceProperties2', 'VkPhysicalDeviceLimits', 'VkPhysicalDeviceSparseProperties',
+        'VkQueueFamilyProperties', 'VkQueueFamilyProperties2',
+        'VkFormatProperties', 'VkFormatProperties2', 'VkFormatProperties3',
+        'VkSparseImageFormatProperties'
+    ]
+
+    # Enums needed regardless of the profiles' contents
+    baseEnums = [ 'VkStructureType', 'VkFormat' ]
+
+    # Structures through which capabilities are queried
+    chainBaseStructs = [ 'VkPhysicalDeviceFeatures2', 'VkPhysicalDeviceProperties2', 'VkQueueFamilyProperties2', 'VkFormatProperties2' ]
+
+    # Registry sections not used by any of the generators
+    droppedSections = [ 'comment', 'tags', 'commands', 'spirvextensions', 'spirvcapabilities', 'sync', 'videocodecs' ]
+
+    def __init__(self, registry, registryFile, profiles):
+        self.registry = registry
+        self.registryFile = registryFile
+        self.profiles = profiles
+
+        # Map all type names including aliases to the names of the corresponding registry entries
+        self.bitmaskNames = dict()
+        for name, bitmaskDef in self.registry.bitmasks.items():
+            for alias in bitmaskDef.aliases:
+                self.bitmaskNames[alias] = name
+
+        self.collectClosure()
+
+
+    def collectClosure(self):
+        self.structs = set()
+        self.enums = set()
+        self.bitmasks = set()
+        self.extensions = set()
+
+        structQueue = []
+        extensionQueue = []
+
+        structQueue.extend(self.baseStructs)
+        for profile in self.profiles.values():
+            caps = profile.capabilities
+            structQueue.extend(caps.features.keys())
+            structQueue.extend(caps.properties.keys())
+            for formatProps in caps.formats.values():
+                structQueue.extend(formatProps.keys())
+            for queueFamilyProps in caps.queueFamiliesProperties:
+                structQueue.extend(queueFamilyProps.keys())
+            for structDefs in [ profile.structs.feature, profile.structs.property, profile.structs.queueFamily, profile.structs.format ]:
+                structQueue.extend([ structDef.name for structDef in structDefs ])
+            extensionQueue.extend(caps.extensions.keys())
+
+        # The device capability structures of all core versions are needed to build the
+        # version feature and limit tables
+        for versionStructs in self.registry.structsByVersion.values():
+            structQueue.extend(self.filterChainableStructs(versionStructs))
+
+        for enumName in self.baseEnums:
+            self.addEnum(enumName)
+
+        while len(structQueue) > 0 or len(extensionQueue) > 0:
+            while len(structQueue) > 0:
+                name = structQueue.pop()
+                if name in self.structs or not name in self.registry.structs:
+                    continue
+
+                structDef = self.registry.structs[name]
+                self.structs.add(name)
+                structQueue.extend(structDef.aliases)
+                extensionQueue.extend(structDef.definedByExtensions)
+                for member in structDef.members.values():
+                    if member.type in self.registry.structs:
+                        structQueue.append(member.type)
+                    elif member.type in self.registry.enums:
+                        self.addEnum(member.type)
+                    elif member.type in self.bitmaskNames:
+                        self.addBitmask(member.type)
+
+            while len(extensionQueue) > 0:
+                name = extensionQueue.pop()
+                if name in self.extensions or not name in self.registry.extensions:
+                    continue
+
+                extension = self.registry.extensions[name]
+                self.extensions.add(name)
+                if extension.promotedTo != None:
+                    extensionQueue.append(extension.promotedTo)
+                structQueue.extend(self.filterChainableStructs(self.registry.structsByExtension.get(name, [])))
+
+
+    def filterChainableStructs(self, structNames):
+        result = []
+        for name in structNames:
+            for base in self.chainBaseStructs:
+                if base in self.registry.structs[name].extends:
+                    result.append(name)
+                    break
+        return result
+
+
+    def addEnum(self, name):
+        if not name in self.enums and name in self.registry.enums:
+            self.enums.update(self.registry.enums[name].aliases)
+
+
+    def addBitmask(self, name):
+        bitmaskDef = self.registry.bitmasks[self.bitmaskNames[name]]
+        self.bitmasks.update(bitmaskDef.aliases)
+        if bitmaskDef.bitsType != None:
+            self.addEnum(bitmaskDef.bitsType.name)
+
+
+    def isTypeKept(self, name):
+        if name in self.registry.structs:
+            return name in self.structs
+        elif name in self.registry.enums:
+            return name in self.enums
+        elif name in self.bitmaskNames:
+            return name in self.bitmasks
+        else:
+            return True
+
+
+    def generate(self, outRegistry):
+        Log.i("Generating '{0}'...".format(outRegistry))
+        tree = etree.parse(self.registryFile)
+        root = tree.getroot()
+        for child in list(root):
+            if child.tag in self.droppedSections:
+                root.remove(child)
+            elif child.tag == 'types':
+                for type in list(child):
+                    name = type.get('name')
+                    if name is None and type.find('./name') != None:
+                        name = type.find('./name').text
+                    if type.get('category') in [ 'struct', 'enum', 'bitmask' ] and not self.isTypeKept(name):
+                        child.remove(type)
+            elif child.tag == 'enums':
+                if child.get('name') != 'API Constants' and not child.get('name') in self.enums:
+                    root.remove(child)
+            elif child.tag == 'feature':
+                self.trimRequirements(child)
+            elif child.tag == 'extensions':
+                for extension in list(child):
+                    if extension.get('name') in self.extensions:
+                        self.trimRequirements(extension)
+                    else:
+                        child.remove(extension)
+
+        Log.i("Registry subset contains {0} structures, {1} enums, {2} bitmasks, and {3} extensions".format(
+            len(self.structs), len(self.enums), len(self.bitmasks), len(self.extensions)))
+        tree.write(outRegistry, encoding = 'UTF-8', xml_declaration = True)
+
+
+    def trimRequirements(self, xml):
+        for require in xml.findall('./require'):
+            for requirement in list(require):
+                if requirement.tag == 'command':
+                    require.remove(requirement)
+                elif requirement.tag == 'type' and not self.isTypeKept(requirement.get('name')):
+                    require.remove(requirement)
+                elif requirement.tag == 'enum' and requirement.get('extends') != None and not requirement.get('extends') in self.enums:
+                    require.remove(requirement)
+
+
+class VulkanXmlBackendCheck():
+    # Checks that every available XML backend and parsing mode produces the same registry, and the
+    # same schema and library when generated from it
+    def run(registryFile, profilesDir = None):
+        variants = [ ('etree', True), ('etree', False) ]
+        if lxmletree != None:
+            variants += [ ('lxml', True), ('lxml', False) ]
+        else:
+            Log.w("The lxml module is not installed, only checking the standard library XML backend")
+
+        with tempfile.TemporaryDirectory() as outDir:
+            outputs = []
+            for backend, streaming in variants:
+                name = '{0}-{1}'.format(backend, 'stream' if streaming else 'tree')
+                registry = VulkanRegistry(registryFile, streaming = streaming, backend = backend)
+                outputs.append((name, VulkanXmlBackendCheck.getEntries(registry), VulkanXmlBackendCheck.generate(registry, profilesDir, os.path.join(outDir, name))))
+
+            success = True
+            refName, refEntries, refDir = outputs[0]
+            for name, entries, dir in outputs[1:]:
+                if entries != refEntries:
+                    Log.e("Registry loaded with '{0}' differs from the one loaded with '{1}'".format(name, refName))
+                    success = False
+                for file in VulkanXmlBackendCheck.getFiles(refDir):
+                    if not filecmp.cmp(os.path.join(refDir, file), os.path.join(dir, file), shallow = False):
+                        Log.e("Generated '{0}' with '{1}' differs from the one generated with '{2}'".format(file, name, refName))
+                        success = False
+
+        if success:
+            Log.i("All XML backends produced identical results: {0}".format(', '.join([ output[0] for output in outputs ])))
+        return success
+
+
+    def getEntries(registry):
+        # Flattens the registry object graph into a list of (kind, payload) entries of literals,
+        # where kind is a container type or registry class name, and references to other entries
+        # are single element tuples holding the entry index, so that registries can be compared
+        entries = []
+        indices = dict()
+        def encode(value):
+            if value is None or isinstance(value, (str, int, float, bool)):
+                return value
+            if id(value) in indices:
+                return (indices[id(value)],)
+
+            index = len(entries)
+            indices[id(value)] = index
+            entries.append(None)
+
+            kind = type(value).__name__
+            if kind in [ 'list', 'tuple' ]:
+                payload = tuple([ encode(element) for element in value ])
+            elif kind in [ 'set', 'frozenset' ]:
+                # Sets are sorted so that equal registries always produce equal entries
+                payload = tuple([ encode(element) for element in sorted(value, key = repr) ])
+            elif kind in [ 'dict', 'OrderedDict' ]:
+                payload = tuple([ (encode(key), encode(element)) for key, element in value.items() ])
+            elif kind in VulkanRegistryUnpickler.allowedClasses:
+                payload = tuple([ (name, encode(attribute)) for name, attribute in VulkanXmlBackendCheck.getAttributes(value) ])
+            else:
+                Log.f("Unexpected type in registry: '{0}'".format(kind))
+            entries[index] = (kind, payload)
+            return (index,)
+
+        encode(registry)
+        return entries
+
+
+    def getAttributes(obj):
+        if hasattr(obj, '__dict__'):
+            return list(vars(obj).items())
+        attributes = []
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, '__slots__', []):
+                if hasattr(obj, name):
+                    attributes.append((name, getattr(obj, name)))
+        return attributes
+
+
+    def generate(registry, profilesDir, outDir):
+        os.makedirs(outDir)
+        generator = VulkanProfilesSchemaGenerator(registry)
+        generator.generate(os.path.join(outDir, 'profiles_schema.json'))
+        if profilesDir != None:
+            profiles = VulkanProfiles.loadFromDir(registry, profilesDir, False, generator.schema)
+            VulkanProfilesLibraryGenerator(registry, profiles).generate(outDir, outDir)
+        return outDir
+
+
+    def getFiles(dir):
+        return sorted([ file for file in os.listdir(dir) if os.path.isfile(os.path.join(dir, file)) ])
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
 
@@ -4327,6 +6741,10 @@ if __name__ == '__main__':
                         help='Use specified registry file instead of vk.xml')
     parser.add_argument('--input', '-i', action='store', required=True,
                         help='Path to directory with profiles.')
+    parser.add_argument('--input-profiles', action='store',
+                        help='Comma separated list of the profiles to use from the input directory, instead of all of them')
+    parser.add_argument('--profile-index', action='store',
+                        help='Index file mapping profile names to the input files defining them, used to only open the files of the --input-profiles')
     parser.add_argument('--output-library-inc', action='store',
                         help='Output include directory for profile library')
     parser.add_argument('--output-library-src', action='store',
@@ -4335,14 +6753,45 @@ if __name__ == '__main__':
                         help='Output file for JSON profile schema')
     parser.add_argument('--output-doc', action='store',
                         help='Output file for profiles markdown documentation')
+    parser.add_argument('--output-validator', action='store',
+                        help='Output file for a Python module validating JSON profiles against the schema')
+    parser.add_argument('--output-registry-subset', action='store',
+                        help='Output file for a registry subset that only contains what the profiles need')
     parser.add_argument('--validate', '-v', action='store_true',
                         help='Validate generated JSON profile schema and JSON profiles against the schema')
     parser.add_argument('--debug', '-d', action='store_true',
                         help='Also generate library variant with debug messages')
+    parser.add_argument('--jobs', '-j', action='store', type=int, default=1,
+                        help='Number of worker processes used to load and validate the profiles')
+    parser.add_argument('--validation-cache', action='store',
+                        help='Directory used to cache the validation results of unchanged profile files')
+    parser.add_argument('--profile-cache', action='store',
+                        help='Directory used to cache the profiles derived from unchanged profile files')
+    parser.add_argument('--stream-profiles', action='store_true',
+                        help='Only decode the profiles and the capability blocks they reference from profile files that do not need validation')
+    parser.add_argument('--specialized-validator', action='store_true',
+                        help='Validate JSON profiles with validation code generated from the schema instead of jsonschema')
+    parser.add_argument('--registry-cache', action='store',
+                        help='Directory used to cache the parsed registry across invocations')
+    parser.add_argument('--header-registries', action='store',
+                        help='Comma separated list of registry files of other header versions, used to report the oldest header version defining what each profile requires')
+    parser.add_argument('--memory-report', action='store_true',
+                        help='Print an estimate of the memory used by the parsed registry')
+    parser.add_argument('--profile-registry', action='store_true',
+                        help='Print the time spent in each step of loading the registry')
+    parser.add_argument('--xml-backend', action='store', choices=VulkanXmlBackend.names, default='auto',
+                        help='XML parser used to load the registry, lxml is used when available if set to auto')
+    parser.add_argument('--check-xml-backends', action='store_true',
+                        help='Check that all available XML backends produce identical registries, schema and library')
 
     args = parser.parse_args()
 
-    if args.output_library_inc is None and args.output_schema is None and args.output_doc is None and not args.validate:
+    if args.check_xml_backends:
+        if not VulkanXmlBackendCheck.run(args.registry, args.input):
+            exit(1)
+        exit()
+
+    if args.output_library_inc is None and args.output_schema is None and args.output_doc is None and args.output_registry_subset is None and args.output_validator is None and args.header_registries is None and not args.validate:
         parser.print_help()
         exit()
 
@@ -4364,21 +6813,45 @@ if __name__ == '__main__':
             parser.print_help()
             exit()
 
+    if args.output_registry_subset != None:
+        if args.registry is None or args.input is None:
+            Log.e("Generating the registry subset requires specifying --registry, --input and --output-registry-subset arguments")
+            parser.print_help()
+            exit()
+
+    if args.header_registries != None:
+        if args.registry is None or args.input is None:
+            Log.e("Reporting the header versions required by the profiles requires specifying --registry, --input and --header-registries arguments")
+            parser.print_help()
+            exit()
+
     schema = None
 
     if args.registry != None:
-        registry = VulkanRegistry(args.registry)
+        registry = VulkanRegistryCache.load(args.registry, args.registry_cache, args.profile_registry, args.xml_backend)
+        if args.memory_report:
+            Log.i(registry.getMemoryReport())
 
-    if args.output_schema != None or args.validate:
+    if args.output_schema != None or args.output_validator != None or args.validate:
         generator = VulkanProfilesSchemaGenerator(registry)
         if args.output_schema is not None:
             generator.generate(args.output_schema)
+        if args.output_validator is not None:
+            generator.generateValidator(args.output_validator)
         if args.validate:
             generator.validate()
             schema = generator.schema
 
+    profileCache = None
+    if args.profile_cache != None:
+        profileCache = VulkanProfileCache(args.profile_cache, VulkanRegistryCache.getKey(args.registry))
+
     if args.input != None:
-        profiles = VulkanProfiles.loadFromDir(registry, args.input, args.validate, schema)
+        profileNames = args.input_profiles.split(',') if args.input_profiles != None else None
+        profileIndex = VulkanProfileIndex(args.profile_index) if args.profile_index != None else None
+        profiles = VulkanProfiles.loadFromDir(registry, args.input, args.validate, schema, args.jobs, args.validation_cache,
+                                              args.specialized_validator, profileCache, args.stream_profiles,
+                                              profileNames, profileIndex)
 
     if args.output_library_inc != None:
         generator = VulkanProfilesLibraryGenerator(registry, profiles)
@@ -4387,6 +6860,20 @@ if __name__ == '__main__':
             generator = VulkanProfilesLibraryGenerator(registry, profiles, True)
             generator.generate(args.output_library_inc + '/debug', args.output_library_src + '/debug')
 
+    if profileCache != None and args.input != None:
+        profileCache.store()
+
     if args.output_doc != None:
         generator = VulkanProfilesDocGenerator(registry, profiles)
         generator.generate(args.output_doc)
+
+    if args.header_registries != None:
+        registrySet = VulkanRegistrySet([ args.registry ] + args.header_registries.split(','), args.registry_cache)
+        for profile in profiles.values():
+            headerVersion = registrySet.getProfileHeaderVersion(profile)
+            if headerVersion != None:
+                Log.i("Profile '{0}' requires Vulkan header version {1} or newer".format(profile.name, str(headerVersion)))
+
+    if args.output_registry_subset != None:
+        generator = VulkanRegistrySubsetGenerator(registry, args.registry, profiles)
+        generator.generate(args.output_registry_subset)
@@ -178,8 +178,9 @@ class ProfileGenerator():
         gen = ''
         first = True
         self.test_features = list()
-        for name, value  in registry.structs.items():
-            if ('VkPhysicalDeviceFeatures2' in value.extends and value.definedByExtensions):
+        for name in registry.structsByExtends.get('VkPhysicalDeviceFeatures2', []):
+            value = registry.structs[name]
+            if (value.definedByExtensions):
                 self.test_features.append(name)
                 if (first):
                     first = False
@@ -268,8 +269,9 @@ class ProfileGenerator():
         gen = ''
         first = True
         self.test_values = dict()
-        for name, value  in registry.structs.items():
-            if ('VkPhysicalDeviceProperties2' in value.extends and value.definedByExtensions):
+        for name in registry.structsByExtends.get('VkPhysicalDeviceProperties2', []):
+            value = registry.structs[name]
+            if (value.definedByExtensions):
                 self.test_values[name] = dict()
                 if first:
                     first = False
@@ -741,6 +743,8 @@ if __name__ == '__main__':
                         help='Output profiles file')
     parser.add_argument('-outTests', action='store',
                         help='Output tests file')
+    parser.add_argument('-registryCache', action='store',
+                        help='Directory used to cache the parsed registry across invocations')
 
     args = parser.parse_args()
 
@@ -748,7 +752,7 @@ if __name__ == '__main__':
         parser.print_help()
         exit()
 
-    registry = gen_profiles_solution.VulkanRegistry(args.registry)
+    registry = gen_profiles_solution.VulkanRegistryCache.load(args.registry, args.registryCache)
     generator = ProfileGenerator()
     generator.generate_profile(args.outProfile, registry)
     generator.generate_tests(args.outTests, registry)